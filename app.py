@@ -3,7 +3,7 @@
 # CLASSROOM OBSERVATION REPORT 2025 — Read-only Streamlit
 # - Uses ONLY existing materialized views (no CREATE/REFRESH).
 # - Exact headings/wording kept as provided.
-# - One renderer per MV: render_<materialized_view_name>().
+# - One table per MV: render_mv("<materialized_view_name>").
 # - Exports the full bottom section (markdown + all tables) as .md and .xlsx
 # =============================================================================
 # .streamlit/secrets.toml (Supabase)
@@ -15,13 +15,18 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
 import io
+import threading
+import zipfile
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import numpy as np
 
-from utils.supabase.database_manager import get_db
+# get_db() is an st.cache_resource singleton: every page shares one Supabase client
+from utils.supabase.database_manager import get_db, parse_order_by
+from utils.xlsx_export import write_rows, xlsx_book
 
 st.set_page_config(page_title="CLASSROOM OBSERVATION REPORT 2025", layout="wide")
 
@@ -29,61 +34,158 @@ st.set_page_config(page_title="CLASSROOM OBSERVATION REPORT 2025", layout="wide"
 # ---------------------------------------
 # Load ALL materialized views (page-local)
 # ---------------------------------------
-@st.cache_data(show_spinner=False)
-def load_mvs() -> Dict[str, pd.DataFrame]:
+# Each view with the ORDER BY its report table uses; PostgREST returns rows pre-sorted
+MV_ORDER_BY: Dict[str, Optional[str]] = {
+    # Section 1
+    "mv_s1_2_longitudinal_fellow_tracking": "terms_observed DESC",
+    "mv_s1_3_coverage_by_fellowship_year": "term, fellowship_year",
+    "mv_s1_4_coverage_by_coach": "coach_name, term",
+    # Section 2
+    "mv_s2_1_program_wide_domain_evolution": "domain, term",
+    "mv_s2_2_domains_showing_strongest_improvement": "tier3_improvement DESC",
+    "mv_s2_3_domains_stuck_at_tier1": "domain, term",
+    "mv_s2_4_overall_program_improvement_summary": "term",
+    # Section 3
+    "mv_s3_1_year1_vs_year2_gap_evolution": "domain, term",
+    "mv_s3_2_year1_fellow_development_trajectory": "domain, term",
+    "mv_s3_3_experience_gap_change_over_time": "gap_change DESC",
+    # Section 4
+    "mv_s4_1_overall_phase_performance_trajectory": "phase, term",
+    "mv_s4_2_domain_performance_by_phase": "phase, domain, term",
+    "mv_s4_3_phase_performance_summary_term3_only": "phase, pct_tier3 DESC",
+    # Section 5
+    "mv_s5_1_subject_category_performance": "subject_category, term",
+    "mv_s5_2_mathematics_classes_all_domain_performance": "domain, term",
+    "mv_s5_3_language_classes_all_domain_performance": "domain, term",
+    "mv_s5_4_literacy_vs_numeracy_in_math_classes": "domain, term",
+    "mv_s5_5_specific_language_subject_performance_literacy": "subject, term",
+    # Section 6
+    "mv_s6_1_critical_phase_subject_combinations": "improvement ASC",
+    # Section 7
+    "mv_s7_1_high_growth_fellows": "growth DESC",
+    "mv_s7_2_stagnant_declining_fellows": "change ASC",
+    "mv_s7_3_fellow_domain_specific_patterns_high_growth": "fellow_name, domain",
+    # Section 8
+    "mv_s8_1_class_size_impact_on_performance": "class_size_category, term",
+    "mv_s8_2_coach_portfolio_performance": "coach_name, term",
+}
+MV_NAMES = list(MV_ORDER_BY)
+
+# printf display formats for a view's columns (grid + Markdown snapshot only; Excel/CSV keep raw numbers)
+MV_COLUMN_FORMATS: Dict[str, Dict[str, str]] = {
+    "mv_s1_2_longitudinal_fellow_tracking": {"percentage": "%.1f%%", "avg_obs_per_fellow": "%.2f"},
+    "mv_s2_4_overall_program_improvement_summary": {"overall_avg_score": "%.2f", "overall_pct_tier3": "%.1f%%"},
+    "mv_s4_3_phase_performance_summary_term3_only": {"pct_tier3": "%.1f%%"},
+}
+
+
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a fetched view: integers to the smallest lossless width, and repetitive text
+    (terms, domains, phases, coach names) to category. Floats stay float64 so the
+    report tables and exports keep their exact decimals.
+    """
+    for col in df.select_dtypes("integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        try:
+            if df[col].nunique() < 0.5 * len(df):
+                df[col] = df[col].astype("category")
+        except TypeError:
+            pass  # unhashable cells (json/array columns) stay as objects
+    return df
+
+
+@st.cache_data(ttl=3600, max_entries=len(MV_NAMES), show_spinner=False)
+def load_mv(name: str) -> pd.DataFrame:
+    """
+    One cache entry per MV, so refreshing or failing one view never refetches the others.
+    Errors propagate (and so are not cached): a failed view is retried on the next run.
+    attrs["loaded_at"] stamps each fetch, so exports prepared from an older fetch can be told apart.
+    """
     db = get_db()
-    mv_names = [
-        # Section 1
-        "mv_s1_2_longitudinal_fellow_tracking",
-        "mv_s1_3_coverage_by_fellowship_year",
-        "mv_s1_4_coverage_by_coach",
-        # Section 2
-        "mv_s2_1_program_wide_domain_evolution",
-        "mv_s2_2_domains_showing_strongest_improvement",
-        "mv_s2_3_domains_stuck_at_tier1",
-        "mv_s2_4_overall_program_improvement_summary",
-        # Section 3
-        "mv_s3_1_year1_vs_year2_gap_evolution",
-        "mv_s3_2_year1_fellow_development_trajectory",
-        "mv_s3_3_experience_gap_change_over_time",
-        # Section 4
-        "mv_s4_1_overall_phase_performance_trajectory",
-        "mv_s4_2_domain_performance_by_phase",
-        "mv_s4_3_phase_performance_summary_term3_only",
-        # Section 5
-        "mv_s5_1_subject_category_performance",
-        "mv_s5_2_mathematics_classes_all_domain_performance",
-        "mv_s5_3_language_classes_all_domain_performance",
-        "mv_s5_4_literacy_vs_numeracy_in_math_classes",
-        "mv_s5_5_specific_language_subject_performance_literacy",
-        # Section 6
-        "mv_s6_1_critical_phase_subject_combinations",
-        # Section 7
-        "mv_s7_1_high_growth_fellows",
-        "mv_s7_2_stagnant_declining_fellows",
-        "mv_s7_3_fellow_domain_specific_patterns_high_growth",
-        # Section 8
-        "mv_s8_1_class_size_impact_on_performance",
-        "mv_s8_2_coach_portfolio_performance",
-    ]
+    order_by = MV_ORDER_BY.get(name)
+    try:
+        df = db.fetch_table(name, order_by=order_by)  # RLS must allow read
+    except Exception:
+        if not order_by:
+            raise
+        # e.g. an ORDER BY column the view doesn't have: fetch unsorted, get_mv sorts in pandas
+        df, order_by = db.fetch_table(name), None
+    df = _compact_frame(df)
+    df.attrs["order_by"] = order_by
+    df.attrs["loaded_at"] = datetime.now().isoformat()
+    return df
+
+
+def load_mvs() -> Dict[str, pd.DataFrame]:
+    """
+    Fetch every MV concurrently: the PostgREST reads are I/O-bound, so a cold load costs
+    roughly the slowest view instead of the sum of all round-trips. Warm views are cache hits.
+    """
+    # Build the shared client once on the script thread (credential warnings render here)
+    if get_db().client is None:
+        return {name: pd.DataFrame() for name in MV_NAMES}
+
+    # Workers need the script context for st.cache_data to file results under this session
+    ctx = get_script_run_ctx()
+
+    def _fetch(name: str) -> pd.DataFrame:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return load_mv(name)
+
+    with ThreadPoolExecutor(max_workers=min(16, len(MV_NAMES))) as ex:
+        futures = {name: ex.submit(_fetch, name) for name in MV_NAMES}
 
     data: Dict[str, pd.DataFrame] = {}
-    for name in mv_names:
+    failed: list[str] = []
+    for name, fut in futures.items():
         try:
-            data[name] = get_db()._safe_table(name)  # RLS must allow read
+            data[name] = fut.result()
         except Exception as e:
-            st.error(f"Error loading {name}: {e}")
+            failed.append(f"`{name}` ({e})")
             data[name] = pd.DataFrame()
+    if failed:
+        st.warning(
+            f"Could not load {len(failed)} of {len(MV_NAMES)} views; their sections will be empty "
+            "and they will be retried on the next run: " + "; ".join(failed)
+        )
     return data
 
 
-# Load all materialized views at once (cached)
+# Load all materialized views (each one cached independently)
 dfs = load_mvs()
 
 
 # -----------------------------
 # Helpers + Recorder for Export
 # -----------------------------
+@st.cache_data(max_entries=128, show_spinner=False)
+def _df_to_md(df: pd.DataFrame, format_items: tuple = ()) -> str:
+    """
+    Markdown snapshot of a table; to_markdown is slow, and the tables rarely change between reruns.
+    format_items are (column, printf format) pairs applied before conversion, inside the cache.
+    """
+    if format_items:
+        df = df.assign(**{c: df[c].map(lambda v, f=f: f % v if pd.notna(v) else "") for c, f in format_items})
+    return df.to_markdown(index=False)
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _tables_to_xlsx(tables: Dict[str, pd.DataFrame]) -> bytes:
+    """One sheet per captured table; cached on the tables, so re-preparing unchanged data is free."""
+    buf = io.BytesIO()
+    book, header_fmt, date_fmt = xlsx_book(buf)
+    for i, (name, df) in enumerate(tables.items(), 1):
+        sheet = name[:31] if name else "Sheet1"
+        if book.get_worksheet_by_name(sheet):
+            # truncation to Excel's 31 chars can collide
+            sheet = f"{sheet[:27]}_{i}"
+        write_rows(book.add_worksheet(sheet), df, 0, header_fmt, date_fmt)
+    book.close()
+    return buf.getvalue()
+
+
 class ReportRecorder:
     """
     Collects all text (Markdown) + tables rendered on the page,
@@ -104,21 +206,44 @@ class ReportRecorder:
         self.md_chunks.append("\n---\n")
 
     # ----- Tables -----
-    def table(self, df: pd.DataFrame, name: Optional[str] = None, caption: Optional[str] = None):
-        """Render a df and capture it as well."""
-        st.dataframe(df, use_container_width=True, hide_index=True)
+    def table(
+        self,
+        df: pd.DataFrame,
+        name: Optional[str] = None,
+        caption: Optional[str] = None,
+        lazy: bool = False,
+        format_map: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Render a df and capture it as well.
+        lazy=True puts the grid behind a "Show table" checkbox, so it is only serialised to
+        the browser once opened; it is captured for export either way.
+        format_map maps columns to printf formats (e.g. {"pct_tier3": "%.1f%%"}); the grid
+        formats them client-side and the Markdown snapshot stringifies them. Excel keeps raw numbers.
+        """
+        key = name or f"Table_{len(self.tables)+1}"
+        format_map = {
+            c: f for c, f in (format_map or {}).items()
+            if c in df.columns and pd.api.types.is_numeric_dtype(df[c])
+        }
+        if not lazy or st.checkbox(f"Show table: {key}", key=f"open_{key}"):
+            st.dataframe(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={c: st.column_config.NumberColumn(format=f) for c, f in format_map.items()} or None,
+            )
         if caption:
             st.caption(caption)
 
-        # Save table for exports
-        key = name or f"Table_{len(self.tables)+1}"
-        self.tables[key] = df.copy()
+        # Save table for exports (frames are read-only once rendered, so no copy)
+        self.tables[key] = df
 
         # Also add a light Markdown snapshot (first 50 rows) for the .md export
         try:
-            snap = df.head(50)
+            snap = _df_to_md(df.head(50), tuple(format_map.items()))
             self.md_chunks.append(f"\n**{key}**\n\n")
-            self.md_chunks.append(snap.to_markdown(index=False) + "\n\n")
+            self.md_chunks.append(snap + "\n\n")
             if caption:
                 self.md_chunks.append(f"*{caption}*\n\n")
         except Exception:
@@ -130,21 +255,110 @@ class ReportRecorder:
         return "".join(self.md_chunks)
 
     def export_excel(self) -> bytes:
-        buf = io.BytesIO()
-        with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
-            for name, df in self.tables.items():
-                sheet = name[:31] if name else "Sheet1"
-                try:
-                    df.to_excel(writer, sheet_name=sheet, index=False)
-                except Exception:
-                    # fallback to plain cast
-                    df.astype(str).to_excel(writer, sheet_name=sheet, index=False)
-        buf.seek(0)
-        return buf.getvalue()
+        return _tables_to_xlsx(self.tables)
 
 
 rec = ReportRecorder()
 
+# Sectioned workbook layout: one sheet per report section, its views' tables stacked top to bottom
+EXPORT_SECTIONS: Dict[str, list[str]] = {
+    "Section 1 - Coverage & Quality": [
+        "mv_s1_2_longitudinal_fellow_tracking",
+        "mv_s1_3_coverage_by_fellowship_year",
+        "mv_s1_4_coverage_by_coach",
+    ],
+    "Section 2 - Domain Performance": [
+        "mv_s2_1_program_wide_domain_evolution",
+        "mv_s2_2_domains_showing_strongest_improvement",
+        "mv_s2_3_domains_stuck_at_tier1",
+        "mv_s2_4_overall_program_improvement_summary",
+    ],
+    "Section 3 - Experience Effects": [
+        "mv_s3_1_year1_vs_year2_gap_evolution",
+        "mv_s3_2_year1_fellow_development_trajectory",
+        "mv_s3_3_experience_gap_change_over_time",
+    ],
+    "Section 4 - Phase Performance": [
+        "mv_s4_1_overall_phase_performance_trajectory",
+        "mv_s4_2_domain_performance_by_phase",
+        "mv_s4_3_phase_performance_summary_term3_only",
+    ],
+    "Section 5 - Subject Performance": [
+        "mv_s5_1_subject_category_performance",
+        "mv_s5_2_mathematics_classes_all_domain_performance",
+        "mv_s5_3_language_classes_all_domain_performance",
+        "mv_s5_4_literacy_vs_numeracy_in_math_classes",
+        "mv_s5_5_specific_language_subject_performance_literacy",
+    ],
+    "Section 6 - Phase x Subject": [
+        "mv_s6_1_critical_phase_subject_combinations",
+    ],
+    "Section 7 - Fellow Trajectories": [
+        "mv_s7_1_high_growth_fellows",
+        "mv_s7_2_stagnant_declining_fellows",
+        "mv_s7_3_fellow_domain_specific_patterns_high_growth",
+    ],
+    "Section 8 - Contextual Factors": [
+        "mv_s8_1_class_size_impact_on_performance",
+        "mv_s8_2_coach_portfolio_performance",
+    ],
+}
+
+
+def _section_plan(dfs: Dict[str, pd.DataFrame]) -> list[tuple[str, list[tuple[str, pd.DataFrame]]]]:
+    """Each EXPORT_SECTIONS entry with its non-empty (view, frame) pairs; sections with none are dropped."""
+    return [
+        (section, frames)
+        for section, mv_list in EXPORT_SECTIONS.items()
+        if (frames := [(mv, dfs[mv]) for mv in mv_list if dfs.get(mv) is not None and not dfs[mv].empty])
+    ]
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _build_sectioned_xlsx(dfs: Dict[str, pd.DataFrame]) -> bytes:
+    """
+    One sheet per EXPORT_SECTIONS entry with its views stacked (two blank rows between tables).
+    Tables only grow downwards, so constant_memory streaming applies (see xlsx_book).
+    """
+    buf = io.BytesIO()
+    book, header_fmt, date_fmt = xlsx_book(buf)
+    for sheet_name, frames in _section_plan(dfs):
+        ws, row = book.add_worksheet(sheet_name[:31]), 0  # Excel limit 31 chars
+        for _, df in frames:
+            # Leave space before next table
+            row = write_rows(ws, df, row, header_fmt, date_fmt) + 3
+    book.close()
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _build_sectioned_csv_zip(dfs: Dict[str, pd.DataFrame]) -> bytes:
+    """Same layout as the sectioned workbook as <section>/<view>.csv files; fastest deflate level."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for section, frames in _section_plan(dfs):
+            for mv, df in frames:
+                zf.writestr(f"{section}/{mv}.csv", df.to_csv(index=False))
+    return buf.getvalue()
+
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _prepare_download(label: str, state_key: str, data_key, build, file_name: str, mime: str) -> None:
+    """
+    A "Prepare <label>" button that builds the payload into session_state, then its download button.
+    The payload is stored with the data_key it was built from and only offered while that still
+    matches, so a refreshed view never serves an old snapshot under today's date.
+    """
+    if st.button(f"Prepare {label}", use_container_width=True):
+        st.session_state[state_key] = (data_key, build())
+    built_for, payload = st.session_state.get(state_key, (None, None))
+    if built_for == data_key:
+        st.download_button(
+            f"⬇️ Download {label}", data=payload, file_name=file_name, mime=mime, use_container_width=True
+        )
+
 
 def _order_dataframe(df: pd.DataFrame, order_by: str | None) -> pd.DataFrame:
     """
@@ -153,134 +367,54 @@ def _order_dataframe(df: pd.DataFrame, order_by: str | None) -> pd.DataFrame:
     if df is None or df.empty or not order_by:
         return df if isinstance(df, pd.DataFrame) else pd.DataFrame()
 
-    parts = [p.strip() for p in order_by.split(",")]
-    cols: list[str] = []
-    asc: list[bool] = []
-    for p in parts:
-        tokens = p.split()
-        col = tokens[0]
-        direction = tokens[1].upper() if len(tokens) > 1 else "ASC"
-        if col in df.columns:
-            cols.append(col)
-            asc.append(direction != "DESC")
-    if not cols:
+    keys = [(col, asc) for col, asc in parse_order_by(order_by) if col in df.columns]
+    if not keys:
         return df
+    cols, asc = map(list, zip(*keys))
     try:
-        return df.sort_values(cols, ascending=asc)
+        return df.sort_values(cols, ascending=asc, kind="stable", ignore_index=True)
     except Exception:
         return df
 
 
 def get_mv(name: str, order_by: str | None = None) -> pd.DataFrame:
     df = dfs.get(name, pd.DataFrame())
+    if order_by and df.attrs.get("order_by") == order_by:
+        return df  # already sorted by the database
     return _order_dataframe(df, order_by)
 
 
-def pct_fmt(x):
-    try:
-        return f"{float(x):.1f}%"
-    except Exception:
-        return x
+@st.cache_resource(show_spinner=False)
+def _static_tables() -> Dict[str, pd.DataFrame]:
+    """
+    The literal report frames. app.py re-executes on every rerun, so module-level constants
+    would be rebuilt too; cache_resource builds them once per process and hands out the same objects.
+    """
+    return {
+        "exec": pd.DataFrame({
+            "Metric": ["Observations", "Fellows Observed", "Average Domain Score", "% Tier 3 (Advanced)"],
+            "Term 1": ["50", "47", "", ""],
+            "Term 2": ["90", "89", "", ""],
+            "Term 3": ["130", "118", "", ""],
+            "Change": ["+160%", "+151%", "", ""],
+        }),
+        "obs_shell": pd.DataFrame({
+            "Term": ["Term 1","Term 2","Term 3","Program Total"],
+            "Observations": ["50","90","130","270"],
+            "Fellows": ["47","89","118","[Unique]"],
+            "Coaches": ["5","6","6","6"],
+            "Avg Class Size": ["46","38","39","40 avg"],
+            "Avg Attendance": ["95.9%","95.2%","94.1%","95.1% avg"]
+        }),
+    }
 
 
 # =============================================================================
-# EXACT-NAME RENDERERS (1:1 with your MVs)
+# MV RENDERER (one table per view, ORDER BY from MV_ORDER_BY)
 # =============================================================================
-def render_mv_s1_2_longitudinal_fellow_tracking():
-    df = get_mv("mv_s1_2_longitudinal_fellow_tracking", order_by="terms_observed DESC")
-    rec.table(df, name="mv_s1_2_longitudinal_fellow_tracking")
+def render_mv(name: str):
+    rec.table(get_mv(name, order_by=MV_ORDER_BY[name]), name=name, lazy=True, format_map=MV_COLUMN_FORMATS.get(name))
 
-def render_mv_s1_3_coverage_by_fellowship_year():
-    df = get_mv("mv_s1_3_coverage_by_fellowship_year", order_by="term, fellowship_year")
-    rec.table(df, name="mv_s1_3_coverage_by_fellowship_year")
-
-def render_mv_s1_4_coverage_by_coach():
-    df = get_mv("mv_s1_4_coverage_by_coach", order_by="coach_name, term")
-    rec.table(df, name="mv_s1_4_coverage_by_coach")
-
-def render_mv_s2_1_program_wide_domain_evolution():
-    df = get_mv("mv_s2_1_program_wide_domain_evolution", order_by="domain, term")
-    rec.table(df, name="mv_s2_1_program_wide_domain_evolution")
-
-def render_mv_s2_2_domains_showing_strongest_improvement():
-    df = get_mv("mv_s2_2_domains_showing_strongest_improvement", order_by="tier3_improvement DESC")
-    rec.table(df, name="mv_s2_2_domains_showing_strongest_improvement")
-
-def render_mv_s2_3_domains_stuck_at_tier1():
-    df = get_mv("mv_s2_3_domains_stuck_at_tier1", order_by="domain, term")
-    rec.table(df, name="mv_s2_3_domains_stuck_at_tier1")
-
-def render_mv_s2_4_overall_program_improvement_summary():
-    df = get_mv("mv_s2_4_overall_program_improvement_summary", order_by="term")
-    rec.table(df, name="mv_s2_4_overall_program_improvement_summary")
-
-def render_mv_s3_1_year1_vs_year2_gap_evolution():
-    df = get_mv("mv_s3_1_year1_vs_year2_gap_evolution", order_by="domain, term")
-    rec.table(df, name="mv_s3_1_year1_vs_year2_gap_evolution")
-
-def render_mv_s3_2_year1_fellow_development_trajectory():
-    df = get_mv("mv_s3_2_year1_fellow_development_trajectory", order_by="domain, term")
-    rec.table(df, name="mv_s3_2_year1_fellow_development_trajectory")
-
-def render_mv_s3_3_experience_gap_change_over_time():
-    df = get_mv("mv_s3_3_experience_gap_change_over_time", order_by="gap_change DESC")
-    rec.table(df, name="mv_s3_3_experience_gap_change_over_time")
-
-def render_mv_s4_1_overall_phase_performance_trajectory():
-    df = get_mv("mv_s4_1_overall_phase_performance_trajectory", order_by="phase, term")
-    rec.table(df, name="mv_s4_1_overall_phase_performance_trajectory")
-
-def render_mv_s4_2_domain_performance_by_phase():
-    df = get_mv("mv_s4_2_domain_performance_by_phase", order_by="phase, domain, term")
-    rec.table(df, name="mv_s4_2_domain_performance_by_phase")
-
-def render_mv_s4_3_phase_performance_summary_term3_only():
-    df = get_mv("mv_s4_3_phase_performance_summary_term3_only", order_by="phase, pct_tier3 DESC")
-    rec.table(df, name="mv_s4_3_phase_performance_summary_term3_only")
-
-def render_mv_s5_1_subject_category_performance():
-    df = get_mv("mv_s5_1_subject_category_performance", order_by="subject_category, term")
-    rec.table(df, name="mv_s5_1_subject_category_performance")
-
-def render_mv_s5_2_mathematics_classes_all_domain_performance():
-    df = get_mv("mv_s5_2_mathematics_classes_all_domain_performance", order_by="domain, term")
-    rec.table(df, name="mv_s5_2_mathematics_classes_all_domain_performance")
-
-def render_mv_s5_3_language_classes_all_domain_performance():
-    df = get_mv("mv_s5_3_language_classes_all_domain_performance", order_by="domain, term")
-    rec.table(df, name="mv_s5_3_language_classes_all_domain_performance")
-
-def render_mv_s5_4_literacy_vs_numeracy_in_math_classes():
-    df = get_mv("mv_s5_4_literacy_vs_numeracy_in_math_classes", order_by="domain, term")
-    rec.table(df, name="mv_s5_4_literacy_vs_numeracy_in_math_classes")
-
-def render_mv_s5_5_specific_language_subject_performance_literacy():
-    df = get_mv("mv_s5_5_specific_language_subject_performance_literacy", order_by="subject, term")
-    rec.table(df, name="mv_s5_5_specific_language_subject_performance_literacy")
-
-def render_mv_s6_1_critical_phase_subject_combinations():
-    df = get_mv("mv_s6_1_critical_phase_subject_combinations", order_by="improvement ASC")
-    rec.table(df, name="mv_s6_1_critical_phase_subject_combinations")
-
-def render_mv_s7_1_high_growth_fellows():
-    df = get_mv("mv_s7_1_high_growth_fellows", order_by="growth DESC")
-    rec.table(df, name="mv_s7_1_high_growth_fellows")
-
-def render_mv_s7_2_stagnant_declining_fellows():
-    df = get_mv("mv_s7_2_stagnant_declining_fellows", order_by="change ASC")
-    rec.table(df, name="mv_s7_2_stagnant_declining_fellows")
-
-def render_mv_s7_3_fellow_domain_specific_patterns_high_growth():
-    df = get_mv("mv_s7_3_fellow_domain_specific_patterns_high_growth", order_by="fellow_name, domain")
-    rec.table(df, name="mv_s7_3_fellow_domain_specific_patterns_high_growth")
-
-def render_mv_s8_1_class_size_impact_on_performance():
-    df = get_mv("mv_s8_1_class_size_impact_on_performance", order_by="class_size_category, term")
-    rec.table(df, name="mv_s8_1_class_size_impact_on_performance")
-
-def render_mv_s8_2_coach_portfolio_performance():
-    df = get_mv("mv_s8_2_coach_portfolio_performance", order_by="coach_name, term")
-    rec.table(df, name="mv_s8_2_coach_portfolio_performance")
 
 
 # =============================================================================
@@ -302,28 +436,26 @@ High-Impact Teaching Strategies (HITS) assess teaching quality across 5 domains,
 """)
 
 # ---- Executive Summary table (fill from mv_s2_4 and static counts) ----------
-exec_df = pd.DataFrame({
-    "Metric": ["Observations", "Fellows Observed", "Average Domain Score", "% Tier 3 (Advanced)"],
-    "Term 1": ["50", "47", "", ""],
-    "Term 2": ["90", "89", "", ""],
-    "Term 3": ["130", "118", "", ""],
-    "Change": ["+160%", "+151%", "", ""],
-})
+exec_df = _static_tables()["exec"].copy()  # filled in below, so work on a copy
 try:
     prog = get_mv("mv_s2_4_overall_program_improvement_summary", order_by="term")
-    for t in ["Term 1", "Term 2", "Term 3"]:
-        row = prog.loc[prog["term"] == t]
-        if not row.empty:
-            exec_df.loc[exec_df["Metric"]=="Average Domain Score", t] = f'{float(row["overall_avg_score"].iloc[0]):.2f}'
-            exec_df.loc[exec_df["Metric"]=="% Tier 3 (Advanced)", t] = f'{float(row["overall_pct_tier3"].iloc[0]):.1f}%'
-    def delta(a, b):
-        try: return f'{(float(b)-float(a)):+.2f}'
-        except: return ""
-    def delta_pct(a, b):
-        try: return f'{(float(b)-float(a)):+.1f}%'
-        except: return ""
-    exec_df.loc[exec_df["Metric"]=="Average Domain Score","Change"] = delta(exec_df["Term 1"][2] or np.nan, exec_df["Term 3"][2] or np.nan)
-    exec_df.loc[exec_df["Metric"]=="% Tier 3 (Advanced)","Change"] = delta_pct((exec_df["Term 1"][3] or "0").rstrip("%"), (exec_df["Term 3"][3] or "0").rstrip("%"))
+    if not prog.empty:
+        exec_terms = ["Term 1", "Term 2", "Term 3"]
+        # One gather: a row per term (NaN where a term is missing), in column order
+        p = (
+            prog.drop_duplicates("term").set_index("term")[["overall_avg_score", "overall_pct_tier3"]]
+            .apply(pd.to_numeric, errors="coerce")
+            .reindex(exec_terms)
+        )
+        for metric, col, fmt, delta_fmt in [
+            ("Average Domain Score", "overall_avg_score", "{:.2f}", "{:+.2f}"),
+            ("% Tier 3 (Advanced)", "overall_pct_tier3", "{:.1f}%", "{:+.1f}%"),
+        ]:
+            vals = p[col].tolist()
+            change = vals[-1] - vals[0]
+            exec_df.loc[exec_df["Metric"] == metric, exec_terms + ["Change"]] = [
+                fmt.format(v) if pd.notna(v) else "" for v in vals
+            ] + [delta_fmt.format(change) if pd.notna(change) else ""]
 except Exception as e:
     st.caption(f"Note: Could not derive averages from mv_s2_4_overall_program_improvement_summary ({e}).")
 
@@ -341,14 +473,7 @@ rec.hr()
 rec.md("## 1. OBSERVATION COVERAGE & QUALITY")
 
 rec.md("### 1.1 Observation Activity Across Terms")
-obs_shell = pd.DataFrame({
-    "Term": ["Term 1","Term 2","Term 3","Program Total"],
-    "Observations": ["50","90","130","270"],
-    "Fellows": ["47","89","118","[Unique]"],
-    "Coaches": ["5","6","6","6"],
-    "Avg Class Size": ["46","38","39","40 avg"],
-    "Avg Attendance": ["95.9%","95.2%","94.1%","95.1% avg"]
-})
+obs_shell = _static_tables()["obs_shell"]  # never mutated: shared as-is
 rec.table(obs_shell, name="Observation_Activity_Shell")
 
 rec.md("""
@@ -364,116 +489,116 @@ rec.md("""
 
 rec.md("### 1.2 Longitudinal Fellow Tracking")
 rec.md("**[Populate from Query 1.2]**")
-render_mv_s1_2_longitudinal_fellow_tracking()
+render_mv("mv_s1_2_longitudinal_fellow_tracking")
 
 rec.md("### 1.3 Coverage by Fellowship Year")
 rec.md("**[Populate from Query 1.3]**")
-render_mv_s1_3_coverage_by_fellowship_year()
+render_mv("mv_s1_3_coverage_by_fellowship_year")
 
 rec.hr()
 rec.md("## 2. DOMAIN PERFORMANCE TRAJECTORIES")
 
 rec.md("### 2.1 Program-Wide Evolution")
 rec.md("**[Populate from Query 2.1 - Create multi-line chart showing Tier 3 % for all 6 domains across 3 terms]**")
-render_mv_s2_1_program_wide_domain_evolution()
+render_mv("mv_s2_1_program_wide_domain_evolution")
 
 rec.md("### 2.2 Domains Showing Strongest Improvement")
 rec.md("**[Populate from Query 2.2]**")
-render_mv_s2_2_domains_showing_strongest_improvement()
+render_mv("mv_s2_2_domains_showing_strongest_improvement")
 
 rec.md("### 2.3 Persistent Gaps")
 rec.md("**[Populate from Query 2.3 - Domains >60% Tier 1]**")
-render_mv_s2_3_domains_stuck_at_tier1()
+render_mv("mv_s2_3_domains_stuck_at_tier1")
 
 rec.md("### 2.4 Overall Program Quality Score")
 rec.md("**[Populate from Query 2.4]**")
-render_mv_s2_4_overall_program_improvement_summary()
+render_mv("mv_s2_4_overall_program_improvement_summary")
 
 rec.hr()
 rec.md("## 3. EXPERIENCE EFFECT ANALYSIS")
 
 rec.md("### 3.1 Year 1 vs Year 2 Gap Evolution")
 rec.md("**[Populate from Query 3.1 - Create grouped bar chart for each domain showing Y1 vs Y2 across terms]**")
-render_mv_s3_1_year1_vs_year2_gap_evolution()
+render_mv("mv_s3_1_year1_vs_year2_gap_evolution")
 
 rec.md("### 3.2 Year 1 Fellow Development Trajectory")
 rec.md("**[Populate from Query 3.2]**")
-render_mv_s3_2_year1_fellow_development_trajectory()
+render_mv("mv_s3_2_year1_fellow_development_trajectory")
 
 rec.md("### 3.3 Experience Gap Trends")
 rec.md("**[Populate from Query 3.3]**")
-render_mv_s3_3_experience_gap_change_over_time()
+render_mv("mv_s3_3_experience_gap_change_over_time")
 
 rec.hr()
 rec.md("## 4. PHASE-SPECIFIC PERFORMANCE")
 
 rec.md("### 4.1 Overall Phase Trajectories")
 rec.md("**[Populate from Query 4.1]**")
-render_mv_s4_1_overall_phase_performance_trajectory()
+render_mv("mv_s4_1_overall_phase_performance_trajectory")
 
 rec.md("### 4.2 Domain Performance by Phase")
 rec.md("**[Populate from Query 4.2 - Create heatmap showing each phase × domain × term]**")
-render_mv_s4_2_domain_performance_by_phase()
+render_mv("mv_s4_2_domain_performance_by_phase")
 
 rec.md("### 4.3 Phase Performance Summary (Term 3 Snapshot)")
 rec.md("**[Populate from Query 4.3]**")
-render_mv_s4_3_phase_performance_summary_term3_only()
+render_mv("mv_s4_3_phase_performance_summary_term3_only")
 
 rec.hr()
 rec.md("## 5. SUBJECT-SPECIFIC PERFORMANCE")
 
 rec.md("### 5.1 Subject Category Trajectories")
 rec.md("**[Populate from Query 5.1]**")
-render_mv_s5_1_subject_category_performance()
+render_mv("mv_s5_1_subject_category_performance")
 
 rec.md("### 5.2 Mathematics Classes - Full Domain Profile")
 rec.md("**[Populate from Query 5.2]**")
-render_mv_s5_2_mathematics_classes_all_domain_performance()
+render_mv("mv_s5_2_mathematics_classes_all_domain_performance")
 
 rec.md("### 5.3 Language Classes - Full Domain Profile")
 rec.md("**[Populate from Query 5.3]**")
-render_mv_s5_3_language_classes_all_domain_performance()
+render_mv("mv_s5_3_language_classes_all_domain_performance")
 
 rec.md("### 5.4 Literacy vs Numeracy in Math Classes")
 rec.md("**[Populate from Query 5.4]**")
-render_mv_s5_4_literacy_vs_numeracy_in_math_classes()
+render_mv("mv_s5_4_literacy_vs_numeracy_in_math_classes")
 
 rec.md("### 5.5 Language-Specific Literacy Performance")
 rec.md("**[Populate from Query 5.5]**")
-render_mv_s5_5_specific_language_subject_performance_literacy()
+render_mv("mv_s5_5_specific_language_subject_performance_literacy")
 
 rec.hr()
 rec.md("## 6. PHASE × SUBJECT INTERACTIONS")
 
 rec.md("### 6.1 Critical Combinations")
 rec.md("**[Populate from Query 6.1]**")
-render_mv_s6_1_critical_phase_subject_combinations()
+render_mv("mv_s6_1_critical_phase_subject_combinations")
 
 rec.hr()
 rec.md("## 7. INDIVIDUAL FELLOW TRAJECTORIES")
 
 rec.md("### 7.1 High-Growth Fellows")
 rec.md("**[Populate from Query 7.1]**")
-render_mv_s7_1_high_growth_fellows()
+render_mv("mv_s7_1_high_growth_fellows")
 
 rec.md("### 7.2 Stagnant/Declining Fellows")
 rec.md("**[Populate from Query 7.2]**")
-render_mv_s7_2_stagnant_declining_fellows()
+render_mv("mv_s7_2_stagnant_declining_fellows")
 
 rec.md("### 7.3 Fellow Domain-Specific Patterns (High-Growth)")
 rec.md("**[Populate from Query 7.3]**")
-render_mv_s7_3_fellow_domain_specific_patterns_high_growth()
+render_mv("mv_s7_3_fellow_domain_specific_patterns_high_growth")
 
 rec.hr()
 rec.md("## 8. CONTEXTUAL FACTORS")
 
 rec.md("### 8.1 Class Size Impact")
 rec.md("**[Populate from Query 8.1]**")
-render_mv_s8_1_class_size_impact_on_performance()
+render_mv("mv_s8_1_class_size_impact_on_performance")
 
 rec.md("### 8.2 Coach Portfolio Performance")
 rec.md("**[Populate from Query 8.2]**")
-render_mv_s8_2_coach_portfolio_performance()
+render_mv("mv_s8_2_coach_portfolio_performance")
 
 rec.hr()
 rec.md("## 9. KEY FINDINGS")
@@ -549,82 +674,22 @@ st.download_button(
     use_container_width=True,
 )
 
-xlsx_bytes = rec.export_excel()
-st.download_button(
-    "Download All Tables (Excel)",
-    data=xlsx_bytes,
-    file_name=f"classroom_observation_report_tables_{datetime.now().date()}.xlsx",
-    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    use_container_width=True,
-)
+# The exports below are only built on request, keyed on every view's fetch stamp (see load_mv):
+# once the TTL refreshes a view, payloads prepared from the old fetch are no longer offered
+export_key = tuple((name, df.attrs.get("loaded_at")) for name, df in dfs.items())
 
+today = datetime.now().date()
+_prepare_download(
+    "All Tables (Excel)", "_xlsx", export_key, rec.export_excel,
+    f"classroom_observation_report_tables_{today}.xlsx", XLSX_MIME,
+)
+# Sectioned tables as a ZIP of CSVs (one folder per section): far cheaper to build than xlsx
+_prepare_download(
+    "Sectioned Report (CSV ZIP)", "_csv_sections", export_key, lambda: _build_sectioned_csv_zip(dfs),
+    f"classroom_observation_report_sections_{today}.zip", "application/zip",
+)
 # Option 3 (updated): Export to Excel by Section, not per MV
-excel_buffer = io.BytesIO()
-with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
-    # Define sections with their MV names
-    sections = {
-        "Section 1 - Coverage & Quality": [
-            "mv_s1_2_longitudinal_fellow_tracking",
-            "mv_s1_3_coverage_by_fellowship_year",
-            "mv_s1_4_coverage_by_coach",
-        ],
-        "Section 2 - Domain Performance": [
-            "mv_s2_1_program_wide_domain_evolution",
-            "mv_s2_2_domains_showing_strongest_improvement",
-            "mv_s2_3_domains_stuck_at_tier1",
-            "mv_s2_4_overall_program_improvement_summary",
-        ],
-        "Section 3 - Experience Effects": [
-            "mv_s3_1_year1_vs_year2_gap_evolution",
-            "mv_s3_2_year1_fellow_development_trajectory",
-            "mv_s3_3_experience_gap_change_over_time",
-        ],
-        "Section 4 - Phase Performance": [
-            "mv_s4_1_overall_phase_performance_trajectory",
-            "mv_s4_2_domain_performance_by_phase",
-            "mv_s4_3_phase_performance_summary_term3_only",
-        ],
-        "Section 5 - Subject Performance": [
-            "mv_s5_1_subject_category_performance",
-            "mv_s5_2_mathematics_classes_all_domain_performance",
-            "mv_s5_3_language_classes_all_domain_performance",
-            "mv_s5_4_literacy_vs_numeracy_in_math_classes",
-            "mv_s5_5_specific_language_subject_performance_literacy",
-        ],
-        "Section 6 - Phase x Subject": [
-            "mv_s6_1_critical_phase_subject_combinations",
-        ],
-        "Section 7 - Fellow Trajectories": [
-            "mv_s7_1_high_growth_fellows",
-            "mv_s7_2_stagnant_declining_fellows",
-            "mv_s7_3_fellow_domain_specific_patterns_high_growth",
-        ],
-        "Section 8 - Contextual Factors": [
-            "mv_s8_1_class_size_impact_on_performance",
-            "mv_s8_2_coach_portfolio_performance",
-        ],
-    }
-
-    # Loop over sections
-    for sheet_name, mv_list in sections.items():
-        # Create a sheet per section
-        startrow = 0
-        for mv in mv_list:
-            df = dfs.get(mv, pd.DataFrame())
-            if df is not None and not df.empty:
-                # Write section heading
-                df.to_excel(
-                    writer,
-                    sheet_name=sheet_name[:31],  # Excel limit 31 chars
-                    startrow=startrow,
-                    index=False,
-                )
-                # Leave space before next table
-                startrow += len(df) + 3
-
-st.download_button(
-    "⬇️ Download Sectioned Report (Excel)",
-    data=excel_buffer.getvalue(),
-    file_name=f"classroom_observation_report_sections_{datetime.now().date()}.xlsx",
-    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_prepare_download(
+    "Sectioned Report (Excel)", "_xlsx_sections", export_key, lambda: _build_sectioned_xlsx(dfs),
+    f"classroom_observation_report_sections_{today}.xlsx", XLSX_MIME,
 )
@@ -1,14 +1,66 @@
 # filters.py
 from __future__ import annotations
+import re
 import streamlit as st
+from types import MappingProxyType
 from typing import Iterable, Dict, Any, Optional
 
 GLOBAL_KEY = "global_filters"
+MAX_MULTISELECT_OPTIONS = 500  # above this, _multiselect switches to search + capped results
+SEARCH_RESULT_LIMIT = 200
+_GRADE_NUM = re.compile(r"(\d+)\s*$")  # trailing grade number, e.g. "Grade 10" -> 10
+
+# Fallback option lists for the global filters (pages may override via session_state)
+DEFAULT_GLOBAL_FILTER_OPTIONS = MappingProxyType({
+    "cycle_year": (2021, 2022, 2023, 2024, 2025),
+    "terms": ("Term 1", "Term 2", "Term 3", "Term 4"),
+    "coaches": (
+        "Angie Nord", "Cindy Gamanie", "Robin Williams", "Correta Mkansi",
+        "Bruce Oom", "Jo-anne Dreyer", "Tonia van Wyk",
+    ),
+})
 
 # ---- low-level helpers (render to a target; default is st.sidebar)
 def _multiselect(label: str, options: Iterable, default: Iterable, key: str, target=None):
     target = target or st.sidebar
-    return target.multiselect(label, options=list(options), default=list(default), key=key)
+    options, default = list(options), list(default)
+
+    # Very long lists (e.g. fellows from an MV) make the dropdown paint every option;
+    # narrow them with a search box and only hand the widget a bounded slice.
+    if len(options) > MAX_MULTISELECT_OPTIONS:
+        option_set = set(options)
+        # A select-everything default would hand every option straight back to the widget,
+        # so long lists start with at most SEARCH_RESULT_LIMIT values pre-selected.
+        default = default[:SEARCH_RESULT_LIMIT]
+        query = target.text_input(f"{label} search", key=f"{key}_q").strip().lower()
+        matches = [o for o in options if query in str(o).lower()][:SEARCH_RESULT_LIMIT]
+        selected = [o for o in st.session_state.get(key, default) if o in option_set]
+        # Current picks stay selectable; search matches fill the rest of the budget
+        options = list(dict.fromkeys(selected + matches))[:max(SEARCH_RESULT_LIMIT, len(selected))]
+        shown = set(options)
+        default = [d for d in default if d in shown]
+
+    return target.multiselect(label, options=options, default=default, key=key)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _sorted_unique(values: tuple) -> list:
+    """Distinct, sorted option list; cached on the raw values so reruns skip the set + sort."""
+    return sorted(set(values))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _sorted_grades(values: tuple) -> list:
+    """Grades ordered by their numeric suffix ("Grade 8" < "Grade 10"), falling back to plain sort."""
+    uniq = set(values)
+    nums = {v: _GRADE_NUM.search(str(v)) for v in uniq}
+    if all(nums.values()):
+        return sorted(uniq, key=lambda v: int(nums[v].group(1)))
+    return sorted(uniq)
+
+def _column_options(col) -> list:
+    """Sorted distinct values; categoricals already hold them in `.cat.categories` (no scan)."""
+    if hasattr(col, "cat"):
+        return col.cat.categories.tolist()
+    return sorted(col.dropna().unique().tolist())
 
 def _radio(label: str, options: Iterable, key: str, horizontal: bool = True, index: int = 0, target=None):
     target = target or st.sidebar
@@ -31,34 +83,27 @@ def topbar(title: str, subtitle: Optional[str] = None, right_nodes: Optional[Dic
                 st.button(label, use_container_width=True)
 
 # ---- global filters
+def _empty_global_filters() -> Dict[str, Any]:
+    return {"cycle_year": [], "terms": [], "coaches": []}
+
 def ensure_global_filters():
-    if GLOBAL_KEY not in st.session_state:
-        st.session_state[GLOBAL_KEY] = {"cycle_year": [], "terms": [], "coaches": []}
+    st.session_state.setdefault(GLOBAL_KEY, _empty_global_filters())
 
 def reset_global_filters():
-    if GLOBAL_KEY in st.session_state:
-        del st.session_state[GLOBAL_KEY]
-    ensure_global_filters()
+    st.session_state[GLOBAL_KEY] = _empty_global_filters()
+
+def _section_header(target, title: str, note: str) -> None:
+    """Heading and note for a sidebar filter section, sent as one markdown element."""
+    target.markdown(f"### {title}\n\n*{note}*")
 
 def write_global_filters(target=None) -> Dict[str, Any]:
     """Renders Cycle Year, Term, Coach in the SIDEBAR (by default)."""
     target = target or st.sidebar
     ensure_global_filters()
 
-    target.markdown("### 🌐 Global Filters")
-    target.caption("These filters apply across the entire app.")
-
-    opts = st.session_state.get(
-        "global_filter_options",
-        {
-            "cycle_year": [2021, 2022, 2023, 2024, 2025],
-            "terms": ["Term 1", "Term 2", "Term 3", "Term 4"],
-            "coaches": [
-                "Angie Nord", "Cindy Gamanie", "Robin Williams", "Correta Mkansi",
-                "Bruce Oom", "Jo-anne Dreyer", "Tonia van Wyk",
-            ],
-        },
-    )
+    _section_header(target, "🌐 Global Filters", "These filters apply across the entire app.")
+
+    opts = st.session_state.get("global_filter_options", DEFAULT_GLOBAL_FILTER_OPTIONS)
 
     gf = st.session_state[GLOBAL_KEY]
     gf["cycle_year"] = _multiselect("Cycle Year", opts["cycle_year"], gf.get("cycle_year", []), "gf_cycle_year", target)
@@ -66,60 +111,54 @@ def write_global_filters(target=None) -> Dict[str, Any]:
     gf["coaches"]    = _multiselect("Coach",       opts["coaches"],    gf.get("coaches", []),    "gf_coaches",    target)
 
     st.session_state[GLOBAL_KEY] = gf
-    target.markdown("---")
+    target.divider()
     return gf
 
 # ---- page-local filters: observations
 def write_observation_filters(term_options: Iterable[str], subjects: Iterable[str], grades: Iterable[str], target=None) -> Dict[str, Any]:
     target = target or st.sidebar
-    target.markdown("### 🎛️ Observation Filters")
-    target.caption("Applies to the Observations dashboard.")
+    _section_header(target, "🎛️ Observation Filters", "Applies to the Observations dashboard.")
 
     flt_terms    = _multiselect("Term", term_options, term_options, "obs_terms", target)
-    flt_subjects = _multiselect("Subject", sorted(set(subjects)), sorted(set(subjects)), "obs_subjects", target)
+    subjects_sorted = _sorted_unique(tuple(subjects))
+    flt_subjects = _multiselect("Subject", subjects_sorted, subjects_sorted, "obs_subjects", target)
 
-    try:
-        grade_sorted = sorted(set(grades), key=lambda x: int(str(x).split()[-1]))
-    except Exception:
-        grade_sorted = sorted(set(grades))
+    grade_sorted = _sorted_grades(tuple(grades))
     flt_grades = _multiselect("Grade", grade_sorted, grade_sorted, "obs_grades", target)
 
     flt_year = _radio("Fellowship Year", ["Both", "Year 1", "Year 2"], "obs_year", True, 0, target)
 
-    target.markdown("---")
+    target.divider()
     return {"terms": flt_terms, "subjects": flt_subjects, "grades": flt_grades, "year": flt_year}
 
 # ---- page-local filters: academic
 def write_academic_filters(subjects: Iterable[str], phases: Iterable[str], grades: Iterable[str], target=None) -> Dict[str, Any]:
     target = target or st.sidebar
-    target.markdown("### 🎛️ Academic Filters")
-    target.caption("Applies to the Academic Results dashboard.")
+    _section_header(target, "🎛️ Academic Filters", "Applies to the Academic Results dashboard.")
 
-    flt_subjects = _multiselect("Subject", sorted(set(subjects)), sorted(set(subjects)), "acad_subjects", target)
-    flt_phases   = _multiselect("Phase",   sorted(set(phases)),   sorted(set(phases)),   "acad_phases",   target)
+    subjects_sorted = _sorted_unique(tuple(subjects))
+    phases_sorted   = _sorted_unique(tuple(phases))
+    flt_subjects = _multiselect("Subject", subjects_sorted, subjects_sorted, "acad_subjects", target)
+    flt_phases   = _multiselect("Phase",   phases_sorted,   phases_sorted,   "acad_phases",   target)
 
-    try:
-        grade_sorted = sorted(set(grades), key=lambda x: int(str(x).split()[-1]))
-    except Exception:
-        grade_sorted = sorted(set(grades))
+    grade_sorted = _sorted_grades(tuple(grades))
     flt_grades = _multiselect("Grade", grade_sorted, grade_sorted, "acad_grades", target)
 
-    target.markdown("---")
+    target.divider()
     return {"subjects": flt_subjects, "phases": flt_phases, "grades": flt_grades}
 
 # ---- page-local filters: wellbeing
 def write_wellbeing_filters(df, terms: Iterable[str], target=None) -> Dict[str, Any]:
     target = target or st.sidebar
-    target.markdown("### 🎛️ Wellbeing Filters")
-    target.caption("Applies to all Wellbeing tabs.")
+    _section_header(target, "🎛️ Wellbeing Filters", "Applies to all Wellbeing tabs.")
 
-    phase_opts = sorted(df["phase"].dropna().unique().tolist()) if "phase" in df else []
-    fac_opts   = sorted(df["name_of_facilitator"].dropna().unique().tolist()) if "name_of_facilitator" in df else []
+    phase_opts = _column_options(df["phase"]) if "phase" in df else []
+    fac_opts   = _column_options(df["name_of_facilitator"]) if "name_of_facilitator" in df else []
 
     flt_terms        = _multiselect("Term", list(terms), list(terms), "wb_terms", target)
     flt_phase        = _multiselect("School Phase", phase_opts, phase_opts, "wb_phase", target)
     flt_year         = _radio("Fellowship Year", ["Both", "Year 1", "Year 2"], "wb_year", True, 0, target)
     flt_facilitators = _multiselect("Facilitator", fac_opts, fac_opts, "wb_facilitators", target)
 
-    target.markdown("---")
+    target.divider()
     return {"terms": flt_terms, "phase": flt_phase, "year": flt_year, "facilitators": flt_facilitators}
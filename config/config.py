@@ -1,18 +1,23 @@
 import os
 import json
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+@lru_cache(maxsize=1)
+def _load_analysis_config() -> dict:
+    """Read config.json next to this file once per process; every Config() shares the result."""
+    config_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+    with open(config_file_path, 'r') as f:
+        return json.load(f)
+
+
 class Config:
     def __init__(self):
-        # Get the directory where this config.py file is located
-        config_dir = os.path.dirname(os.path.abspath(__file__))
-        config_file_path = os.path.join(config_dir, 'config.json')
-        
-        # Load analysis config from JSON
-        with open(config_file_path, 'r') as f:
-            self.analysis_config = json.load(f)
+        # Analysis config from JSON (parsed once, treat as read-only)
+        self.analysis_config = _load_analysis_config()
     
     # Supabase settings from .env
     SUPABASE_URL = os.getenv('SUPABASE_URL')
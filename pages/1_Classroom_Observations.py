@@ -11,7 +11,7 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 import io, zipfile
 
 # At the top of your dashboard files
@@ -36,6 +36,14 @@ DOMAIN_NAMES = {
 }
 DOMAINS = list(DOMAIN_NAMES.keys())
 
+# Low-cardinality label columns (stored as categoricals) and integer columns that fit small ints.
+# observation_id repeats once per domain in the domain scores, so it is categorical there too:
+# the per-rerun isin against the filtered observations then hashes each id once, not once per row.
+OBS_CATEGORY_COLS = ["coach_name", "fellow_name", "school_name", "subject"]
+OBS_ORDERED_COLS = ["term", "grade"]  # ordered by their trailing number ("Grade 8" < "Grade 10")
+DOMAIN_CATEGORY_COLS = ["observation_id", "domain", "classification"]
+OBS_SMALL_INTS = {"fellowship_year": "int8", "class_size": "int16", "present_learners": "int16"}
+
 COLORS = {
     "terms": {"Term 1": "#4E79A7", "Term 2": "#59A14F", "Term 3": "#F28E2B"},
     "years": {"Year 1": "#4E79A7", "Year 2": "#59A14F"},
@@ -71,6 +79,23 @@ def _grade_key(g):
     except Exception:
         return 9999
 
+def _isin_mask(s: pd.Series, values: tuple) -> np.ndarray:
+    """s.isin(values) as a bool array; a selection covering every category reduces to a code check."""
+    if isinstance(s.dtype, pd.CategoricalDtype) and set(s.cat.categories).issubset(values):
+        return s.cat.codes.to_numpy() >= 0
+    return s.isin(values).to_numpy()
+
+def _compact_frames(df_obs: pd.DataFrame, df_ds: pd.DataFrame):
+    """Labels as categoricals and counts as small ints: smaller cached frames, code-level isin/groupby."""
+    ints = {c: t for c, t in OBS_SMALL_INTS.items() if c in df_obs and pd.api.types.is_integer_dtype(df_obs[c])}
+    ordered = {
+        c: pd.CategoricalDtype(sorted(df_obs[c].dropna().unique(), key=_grade_key), ordered=True)
+        for c in OBS_ORDERED_COLS if c in df_obs
+    }
+    df_obs = df_obs.astype({**{c: "category" for c in OBS_CATEGORY_COLS if c in df_obs}, **ordered, **ints})
+    df_ds = df_ds.astype({c: "category" for c in DOMAIN_CATEGORY_COLS if c in df_ds})
+    return df_obs, df_ds
+
 def _safe(name: str) -> str:
     return str(name).replace("/", "_").replace("\\", "_").replace(" ", "_")[:60]
 
@@ -94,7 +119,7 @@ class Exporter:
 
     def add_table(self, name: str, df: pd.DataFrame):
         if isinstance(df, pd.DataFrame) and not df.empty:
-            self.tables[name] = df.copy()
+            self.tables[name] = df  # recorded tables are not mutated after being added
 
     def add_fig(self, name: str, fig: go.Figure | None):
         if fig is not None:
@@ -105,7 +130,7 @@ class Exporter:
 
     def export_tables_zip(self) -> bytes:
         buf = io.BytesIO()
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
             for name, df in self.tables.items():
                 zf.writestr(f"{_safe(name)}.csv", df.to_csv(index=False).encode("utf-8"))
         buf.seek(0)
@@ -133,7 +158,7 @@ rec = Exporter()
 # =========================
 # Data (DB-backed with safe fallback)
 # =========================
-@st.cache_data(show_spinner=True)
+@st.cache_data(ttl=3600, max_entries=1, show_spinner=True)
 def load_observation_data():
     """
     Loads from Supabase view `v_observation_full`.
@@ -143,6 +168,7 @@ def load_observation_data():
       - df_full         : observation-level with `score` = mean of domain scores
       - TERM_OPTIONS, SUBJECTS, GRADES for filters
     Fallbacks to generated sample data if DB is empty/unavailable.
+    df_full.attrs["loaded_at"] stamps each load, so caches keyed on it invalidate on reload.
     """
     try:
         db = get_db()
@@ -150,7 +176,7 @@ def load_observation_data():
 
         if df_view is not None and not df_view.empty:
             keep_domain_cols = ["observation_id", "domain", "score", "classification"]
-            df_domain_scores = df_view[keep_domain_cols].dropna(subset=["observation_id"]).copy()
+            df_domain_scores = df_view[keep_domain_cols].dropna(subset=["observation_id"])
 
             obs_cols = [
                 "observation_id","term","date_lesson_observed","time_lesson",
@@ -158,10 +184,11 @@ def load_observation_data():
                 "grade","subject","class_size","present_learners",
             ]
             obs_cols = [c for c in obs_cols if c in df_view.columns]
-            df_observations = df_view[obs_cols].drop_duplicates(subset=["observation_id"]).copy()
+            df_observations = df_view[obs_cols].drop_duplicates(subset=["observation_id"])
+            df_observations, df_domain_scores = _compact_frames(df_observations, df_domain_scores)
 
             avg_by_obs = (
-                df_domain_scores.groupby("observation_id", as_index=False)["score"]
+                df_domain_scores.groupby("observation_id", as_index=False, observed=True)["score"]
                 .mean()
                 .rename(columns={"score": "score"})
             )
@@ -171,9 +198,11 @@ def load_observation_data():
             terms_raw = sorted(df_full["term"].dropna().unique(), key=lambda t: term_order.get(t, 999))
             TERM_OPTIONS = [t for t in terms_raw if t in ("Term 1", "Term 2")] or terms_raw[:2]
 
-            SUBJECTS = sorted(df_full["subject"].dropna().unique()) if "subject" in df_full.columns else []
-            GRADES   = sorted(df_full["grade"].dropna().unique(), key=_grade_key) if "grade" in df_full.columns else []
+            # Categories are already sorted: lexically for subject, by grade number for the ordered grade dtype
+            SUBJECTS = df_full["subject"].cat.categories.tolist() if "subject" in df_full.columns else []
+            GRADES   = df_full["grade"].cat.categories.tolist() if "grade" in df_full.columns else []
 
+            df_full.attrs["loaded_at"] = datetime.now().isoformat()
             return df_observations, df_domain_scores, df_full, TERM_OPTIONS, SUBJECTS, GRADES
 
         st.warning("`v_observation_full` returned no rows; using sample data fallback.")
@@ -181,8 +210,8 @@ def load_observation_data():
 
     except Exception:
         # ---------- FALLBACK: sample generator ----------
-        np.random.seed(42)
-        fellows = [f"Fellow {i}" for i in range(1, 96)]
+        rng = np.random.default_rng(42)
+        fellows = np.array([f"Fellow {i}" for i in range(1, 96)])
         coaches = ["Coach Sarah", "Coach John", "Coach Maria", "Coach David", "Coach Lisa"]
         subjects = ["Mathematics", "English", "Life Sciences", "Physical Sciences", "History"]
         grades = ["Grade 8", "Grade 9", "Grade 10", "Grade 11", "Grade 12"]
@@ -190,61 +219,55 @@ def load_observation_data():
         all_terms = ["Term 1", "Term 2", "Term 3"]
         terms = all_terms[:2]
 
-        observations, domain_scores = [], []
-        obs_id_counter = 1
-
-        for term_idx, term in enumerate(terms):
-            num_obs_term = 70 + (term_idx * 15)
-            for _ in range(num_obs_term):
-                fellow = np.random.choice(fellows)
-                fellowship_year = 1 if fellows.index(fellow) < 45 else 2
-                coach = np.random.choice(coaches)
-                subject = np.random.choice(subjects)
-                grade = np.random.choice(grades)
-                school = np.random.choice(schools)
-
-                base_date = datetime(2024, 1, 1) + timedelta(days=term_idx * 90)
-                date_observed = base_date + timedelta(days=np.random.randint(0, 80))
-
-                class_size = np.random.randint(25, 45)
-                present_learners = int(class_size * np.random.uniform(0.8, 0.95))
-
-                obs_id = f"obs_{obs_id_counter}"
-                observations.append({
-                    "observation_id": obs_id, "term": term,
-                    "date_lesson_observed": date_observed.date(),
-                    "time_lesson": f"{np.random.randint(8,15)}:00",
-                    "fellowship_year": fellowship_year, "coach_name": coach,
-                    "fellow_name": fellow, "school_name": school,
-                    "grade": grade, "subject": subject,
-                    "class_size": class_size, "present_learners": present_learners,
-                })
-
-                base_score = 2.0 + (fellowship_year - 1) * 0.4 + term_idx * 0.25
-                difficulty = {"LE": 0.3, "SE": 0.2, "KPC": 0.1, "AII": -0.1, "IAL": -0.2, "IAN": -0.3}
-
-                for d in ["KPC","LE","SE","AII","IAL","IAN"]:
-                    s = base_score + difficulty[d] + np.random.uniform(-0.3, 0.3)
-                    s = max(1.0, min(4.0, s))
-                    tier = "Tier 1" if s < 2.3 else ("Tier 2" if s < 3.2 else "Tier 3")
-                    domain_scores.append({"observation_id": obs_id, "domain": d, "classification": tier, "score": round(s, 2)})
-
-                obs_id_counter += 1
-
-        df_observations = pd.DataFrame(observations)
-        df_domain_scores = pd.DataFrame(domain_scores)
+        # All observations drawn at once: 70 in the first term, 15 more each term after
+        term_idx = np.repeat(np.arange(len(terms)), [70 + i * 15 for i in range(len(terms))])
+        n = len(term_idx)
+        fellow_idx = rng.integers(0, len(fellows), n)
+        fellowship_year = np.where(fellow_idx < 45, 1, 2)
+        class_size = rng.integers(25, 45, n)
+        obs_ids = np.char.add("obs_", np.arange(1, n + 1).astype(str))
+        days = term_idx * 90 + rng.integers(0, 80, n)
+
+        df_observations = pd.DataFrame({
+            "observation_id": obs_ids, "term": np.asarray(terms)[term_idx],
+            "date_lesson_observed": (np.datetime64("2024-01-01", "D") + days).astype(object),
+            "time_lesson": np.char.add(rng.integers(8, 15, n).astype(str), ":00"),
+            "fellowship_year": fellowship_year, "coach_name": rng.choice(coaches, n),
+            "fellow_name": fellows[fellow_idx], "school_name": rng.choice(schools, n),
+            "grade": rng.choice(grades, n), "subject": rng.choice(subjects, n),
+            "class_size": class_size, "present_learners": (class_size * rng.uniform(0.8, 0.95, n)).astype(int),
+        })
+
+        # (n, domains) score matrix: experience/term base + per-domain difficulty + noise
+        difficulty = {"LE": 0.3, "SE": 0.2, "KPC": 0.1, "AII": -0.1, "IAL": -0.2, "IAN": -0.3}
+        base_score = 2.0 + (fellowship_year - 1) * 0.4 + term_idx * 0.25
+        scores = np.clip(
+            base_score[:, None] + np.array([difficulty[d] for d in DOMAINS]) + rng.uniform(-0.3, 0.3, (n, len(DOMAINS))),
+            1.0, 4.0,
+        )
+        df_domain_scores = pd.DataFrame({
+            "observation_id": np.repeat(obs_ids, len(DOMAINS)),
+            "domain": np.tile(DOMAINS, n),
+            "classification": np.select([scores < 2.3, scores < 3.2], ["Tier 1", "Tier 2"], default="Tier 3").ravel(),
+            "score": scores.round(2).ravel(),
+        })
+
+        df_observations, df_domain_scores = _compact_frames(df_observations, df_domain_scores)
         df_full = df_observations.merge(
-            df_domain_scores.groupby("observation_id")["score"].mean().reset_index(),
+            df_domain_scores.groupby("observation_id", observed=True)["score"].mean().reset_index(),
             on="observation_id", how="left",
         )
         TERM_OPTIONS = ["Term 1", "Term 2"]
-        SUBJECTS = sorted(df_observations["subject"].unique())
-        GRADES = sorted(df_observations["grade"].unique(), key=_grade_key)
+        SUBJECTS = df_observations["subject"].cat.categories.tolist()
+        GRADES = df_observations["grade"].cat.categories.tolist()
 
+        df_full.attrs["loaded_at"] = datetime.now().isoformat()
         return df_observations, df_domain_scores, df_full, TERM_OPTIONS, SUBJECTS, GRADES
 
 # Load data now (DB or fallback)
 df_observations, df_domain_scores, df_full, TERM_OPTIONS, SUBJECTS, GRADES = load_observation_data()
+# fellow_name is categorical (see _compact_frames): its categories are exactly the distinct fellows
+TOTAL_FELLOWS = len(df_observations["fellow_name"].cat.categories)
 
 # =========================
 # Sidebar Filters
@@ -253,9 +276,9 @@ with st.sidebar:
     st.header("🎛️ Filters")
     st.caption("These apply across all sections.")
     flt_terms = st.multiselect("Term", options=TERM_OPTIONS, default=TERM_OPTIONS, key="flt_terms")
-    flt_subjects = st.multiselect("Subject", options=sorted(SUBJECTS), default=list(SUBJECTS), key="flt_subjects")
-    grade_sorted = sorted(GRADES, key=_grade_key)
-    flt_grades = st.multiselect("Grade", options=grade_sorted, default=grade_sorted, key="flt_grades")
+    # SUBJECTS / GRADES come out of the cached loader already in display order
+    flt_subjects = st.multiselect("Subject", options=SUBJECTS, default=SUBJECTS, key="flt_subjects")
+    flt_grades = st.multiselect("Grade", options=GRADES, default=GRADES, key="flt_grades")
     flt_year = st.radio("Fellowship Year", options=["Both", "Year 1", "Year 2"], horizontal=True, key="flt_year")
     st.markdown("---")
     if st.button("♻️ Reset filters", use_container_width=True):
@@ -263,15 +286,47 @@ with st.sidebar:
         st.rerun()
 
 # Apply filters (global)
-filtered = df_full[
-    df_full["term"].isin(flt_terms)
-    & df_full["subject"].isin(flt_subjects)
-    & df_full["grade"].isin(flt_grades)
-].copy()
-if flt_year != "Both":
-    y = 1 if flt_year.endswith("1") else 2
-    filtered = filtered[filtered["fellowship_year"] == y]
-filtered_domain = df_domain_scores[df_domain_scores["observation_id"].isin(filtered["observation_id"])].copy()
+@st.cache_data(max_entries=16, show_spinner=False)
+def apply_filters(loaded_at: str, terms: tuple, subjects: tuple, grades: tuple, year: str,
+                  _df_full: pd.DataFrame, _df_domain_scores: pd.DataFrame):
+    """
+    Observation rows and their domain-score rows matching the sidebar filters. The domain rows
+    carry their observation's term and fellowship_year, joined once here for every domain chart.
+    Keyed on the filter tuple plus the data load stamp only; the frames themselves are not hashed.
+    """
+    # Masks are and-ed as plain numpy bool arrays; the default "everything selected" filters skip isin
+    mask = (
+        _isin_mask(_df_full["term"], terms)
+        & _isin_mask(_df_full["subject"], subjects)
+        & _isin_mask(_df_full["grade"], grades)
+    )
+    if year != "Both":
+        mask &= (_df_full["fellowship_year"] == (1 if year.endswith("1") else 2)).to_numpy()
+    filtered = _df_full[mask]
+    filtered_domain = _df_domain_scores[_df_domain_scores["observation_id"].isin(filtered["observation_id"])].merge(
+        filtered[["observation_id", "term", "fellowship_year"]], on="observation_id", how="left"
+    )
+    return filtered, filtered_domain
+
+# Everything the filtered frames (and the figures built from them) depend on; cache key for both
+filter_key = (
+    df_full.attrs.get("loaded_at", ""), tuple(flt_terms), tuple(flt_subjects), tuple(flt_grades), flt_year,
+)
+filtered, filtered_domain = apply_filters(*filter_key, df_full, df_domain_scores)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def report_aggregates(filter_key, _filtered: pd.DataFrame, _filtered_domain: pd.DataFrame) -> dict:
+    """Mean scores the progression and domain charts slice from, grouped once per filter state."""
+    return {
+        "term_avg": _filtered.groupby("term", as_index=False, observed=True)["score"].mean(),
+        "term_year_avg": _filtered.groupby(["term", "fellowship_year"], as_index=False, observed=True)["score"].mean(),
+        "domain_term": _filtered_domain.groupby(["domain", "term"], as_index=False, observed=True)["score"].mean(),
+        "domain_term_year": _filtered_domain.groupby(
+            ["domain", "term", "fellowship_year"], as_index=False, observed=True
+        )["score"].mean(),
+    }
+
+aggs = report_aggregates(filter_key, filtered, filtered_domain)
 
 # =========================
 # Header
@@ -284,13 +339,15 @@ st.divider()
 # =========================
 # Helper computations (fig factories)
 # =========================
+# Fig factories are cached on filter_key plus their own options; the frame arguments are
+# unhashed (leading underscore) since filter_key already identifies them.
 def compute_kpis(df):
     if df.empty:
-        return {"total_obs": 0, "fellows_observed": 0, "total_fellows": df_observations["fellow_name"].nunique(),
+        return {"total_obs": 0, "fellows_observed": 0, "total_fellows": TOTAL_FELLOWS,
                 "coverage": 0.0, "growth": np.nan, "first_mean": np.nan, "latest_avg": np.nan, "latest_count": 0}
     total_obs = len(df)
     fellows_observed = df["fellow_name"].nunique()
-    total_fellows = df_observations["fellow_name"].nunique()
+    total_fellows = TOTAL_FELLOWS
     coverage = (fellows_observed / total_fellows * 100) if total_fellows else 0.0
 
     if len(flt_terms) >= 2:
@@ -310,9 +367,10 @@ def compute_kpis(df):
             "coverage": coverage, "growth": growth, "first_mean": first_mean,
             "latest_avg": latest_avg, "latest_count": latest_count}
 
-def line_progression_overall(df):
-    if df.empty: return go.Figure()
-    term_avg = df.groupby("term", as_index=False)["score"].mean().sort_values("term")
+@st.cache_data(max_entries=32, show_spinner=False)
+def line_progression_overall(filter_key, _term_avg):
+    if _term_avg.empty: return go.Figure()
+    term_avg = _term_avg.sort_values("term")
     fig = px.line(
         term_avg, x="term", y="score", markers=True,
         title="Overall Teaching Quality Across Terms",
@@ -323,9 +381,10 @@ def line_progression_overall(df):
     fig.update_layout(height=380, yaxis=dict(range=[0, 4]))
     return fig, term_avg.rename(columns={"score":"avg_score"})
 
-def line_progression_by_year(df):
-    if df.empty: return go.Figure()
-    term_avg = df.groupby(["term", "fellowship_year"], as_index=False)["score"].mean()
+@st.cache_data(max_entries=32, show_spinner=False)
+def line_progression_by_year(filter_key, _term_year_avg):
+    if _term_year_avg.empty: return go.Figure()
+    term_avg = _term_year_avg.copy()
     term_avg["Year"] = "Year " + term_avg["fellowship_year"].astype(int).astype(str)
     fig = px.line(
         term_avg, x="term", y="score", color="Year", markers=True,
@@ -336,11 +395,11 @@ def line_progression_by_year(df):
     fig.update_layout(height=380, yaxis=dict(range=[0, 4]))
     return fig, term_avg.rename(columns={"score":"avg_score"})
 
-def domain_term_bar(df_domain, df_obs):
-    if df_domain.empty or df_obs.empty: return go.Figure(), pd.DataFrame()
-    data = df_domain.merge(df_obs[["observation_id", "term"]], on="observation_id", how="left")
-    domain_term = data.groupby(["domain", "term"], as_index=False)["score"].mean()
-    domain_term["domain_name"] = domain_term["domain"].map(DOMAIN_NAMES)
+@st.cache_data(max_entries=32, show_spinner=False)
+def domain_term_bar(filter_key, _domain_term):
+    """_domain_term: mean score per domain and term (aggs["domain_term"])."""
+    if _domain_term.empty: return go.Figure(), pd.DataFrame()
+    domain_term = _domain_term.assign(domain_name=_domain_term["domain"].map(DOMAIN_NAMES))
     fig = px.bar(
         domain_term, x="domain_name", y="score", color="term", barmode="group",
         title="Domain Performance Across Terms",
@@ -350,16 +409,16 @@ def domain_term_bar(df_domain, df_obs):
     fig.update_layout(height=480, yaxis=dict(range=[0, 4]))
     return fig, domain_term.rename(columns={"score":"avg_score"})
 
-def latest_domain_bar(df_domain, df_obs, split_by_year=False):
+@st.cache_data(max_entries=32, show_spinner=False)
+def latest_domain_bar(filter_key, _domain_term, _domain_term_year, split_by_year=False):
+    """Slices the latest filtered term out of the shared domain aggregates."""
     latest = max(flt_terms) if flt_terms else None
-    if (latest is None) or df_domain.empty or df_obs.empty:
+    if (latest is None) or _domain_term.empty:
         return go.Figure(), pd.DataFrame()
-    data = df_domain.merge(df_obs[["observation_id", "term", "fellowship_year"]], on="observation_id", how="left")
-    data = data[data["term"] == latest]
-    if data.empty: return go.Figure(), pd.DataFrame()
+    if not (_domain_term["term"] == latest).any(): return go.Figure(), pd.DataFrame()
 
     if split_by_year and flt_year == "Both":
-        g = data.groupby(["domain", "fellowship_year"], as_index=False)["score"].mean()
+        g = _domain_term_year[_domain_term_year["term"] == latest].drop(columns="term")
         g["Year"] = "Year " + g["fellowship_year"].astype(int).astype(str)
         g["domain_name"] = g["domain"].map(DOMAIN_NAMES)
         fig = px.bar(
@@ -370,7 +429,7 @@ def latest_domain_bar(df_domain, df_obs, split_by_year=False):
         )
         fig.update_layout(height=460, yaxis=dict(range=[0, 4]))
         return fig, g.rename(columns={"score":"avg_score"})
-    g = data.groupby("domain", as_index=False)["score"].mean()
+    g = _domain_term[_domain_term["term"] == latest].drop(columns="term")
     g["domain_name"] = g["domain"].map(DOMAIN_NAMES)
     g = g.sort_values("score", ascending=True)
     fig = px.bar(
@@ -382,22 +441,17 @@ def latest_domain_bar(df_domain, df_obs, split_by_year=False):
     fig.update_layout(height=460, xaxis=dict(range=[0, 4]))
     return fig, g.rename(columns={"score":"avg_score"})
 
-def tier_stack_for_term(df_domain, df_obs, selected_term):
-    if (df_domain.empty or df_obs.empty or selected_term is None):
+@st.cache_data(max_entries=32, show_spinner=False)
+def tier_stack_for_term(filter_key, _df_domain, selected_term):
+    df_domain = _df_domain
+    if (df_domain.empty or selected_term is None):
         return None, None, pd.DataFrame()
-    data = df_domain.merge(df_obs[["observation_id", "term"]], on="observation_id", how="left")
-    data = data[data["term"] == selected_term]
+    data = df_domain[df_domain["term"] == selected_term]
     if data.empty: return None, None, pd.DataFrame()
 
-    dist = data.groupby(["domain", "classification"], as_index=False).size().rename(columns={"size": "count"})
-    totals = data.groupby("domain", as_index=False).size().rename(columns={"size": "total"})
-    dist = dist.merge(totals, on="domain", how="left")
-    dist["pct"] = (dist["count"] / dist["total"]) * 100
-
-    pivot = dist.pivot(index="domain", columns="classification", values="pct").fillna(0.0)
-    for t in ["Tier 1", "Tier 2", "Tier 3"]:
-        if t not in pivot.columns: pivot[t] = 0.0
-    pivot = pivot[["Tier 1", "Tier 2", "Tier 3"]]
+    pivot = (pd.crosstab(data["domain"], data["classification"], normalize="index") * 100).reindex(
+        columns=["Tier 1", "Tier 2", "Tier 3"], fill_value=0.0
+    )
     pivot["domain_name"] = pivot.index.map(DOMAIN_NAMES)
 
     fig = go.Figure()
@@ -417,10 +471,12 @@ def tier_stack_for_term(df_domain, df_obs, selected_term):
     summary = {"tier3_avg_pct": tier3_pct, "tier2_plus_avg_pct": tier2_plus_pct}
     return fig, summary, pivot.reset_index(drop=False).rename(columns={"index":"domain"})
 
-def bar_by_category(df, category_col, split_by_year=False, title=""):
+@st.cache_data(max_entries=32, show_spinner=False)
+def bar_by_category(filter_key, _df, category_col, split_by_year=False, title=""):
+    df = _df
     if df.empty: return go.Figure(), pd.DataFrame()
     if split_by_year and flt_year == "Both":
-        g = df.groupby([category_col, "fellowship_year"], as_index=False)["score"].mean()
+        g = df.groupby([category_col, "fellowship_year"], as_index=False, observed=True)["score"].mean()
         g["Year"] = "Year " + g["fellowship_year"].astype(int).astype(str)
         fig = px.bar(
             g, x=category_col, y="score", color="Year", barmode="group",
@@ -428,9 +484,9 @@ def bar_by_category(df, category_col, split_by_year=False, title=""):
             color_discrete_map=COLORS["years"],
         )
     else:
-        g = df.groupby(category_col, as_index=False)["score"].mean()
+        g = df.groupby(category_col, as_index=False, observed=True)["score"].mean()
         if category_col == "grade":
-            g["__gnum"] = g[category_col].map(_grade_key)
+            g["__gnum"] = g[category_col].map(_grade_key).astype(int)
             g = g.sort_values("__gnum")
         fig = px.bar(
             g, x=category_col, y="score",
@@ -472,12 +528,12 @@ else:
 
     # Overall progression (by year or total)
     if flt_year == "Both":
-        fig_exec, term_year_tbl = line_progression_by_year(filtered)
+        fig_exec, term_year_tbl = line_progression_by_year(filter_key, aggs["term_year_avg"])
         st.plotly_chart(fig_exec, use_container_width=True)
         rec.add_fig("Executive_Progress_YearSplit", fig_exec)
         rec.add_table("Executive_Term_Year_Averages", term_year_tbl)
     else:
-        fig_exec, term_tbl = line_progression_overall(filtered)
+        fig_exec, term_tbl = line_progression_overall(filter_key, aggs["term_avg"])
         st.plotly_chart(fig_exec, use_container_width=True)
         rec.add_fig("Executive_Progress_Overall", fig_exec)
         rec.add_table("Executive_Term_Averages", term_tbl)
@@ -502,12 +558,12 @@ else:
         split_by_year = st.toggle("Split by Year", value=(flt_year == "Both"), key="split_domains_year")
 
     if view_mode == "Progress (All Terms)":
-        fig_dom, dom_tbl = domain_term_bar(filtered_domain, filtered)
+        fig_dom, dom_tbl = domain_term_bar(filter_key, aggs["domain_term"])
         st.plotly_chart(fig_dom, use_container_width=True)
         rec.add_fig("Domains_Progress_AllTerms", fig_dom)
         rec.add_table("Domains_Avg_by_Term", dom_tbl)
     else:
-        fig_dom, dom_tbl = latest_domain_bar(filtered_domain, filtered, split_by_year=split_by_year)
+        fig_dom, dom_tbl = latest_domain_bar(filter_key, aggs["domain_term"], aggs["domain_term_year"], split_by_year=split_by_year)
         st.plotly_chart(fig_dom, use_container_width=True)
         rec.add_fig("Domains_Latest", fig_dom)
         rec.add_table("Domains_Latest_Table", dom_tbl)
@@ -516,7 +572,7 @@ else:
     valid_terms = sorted(set(flt_terms))
     idx = max(0, len(valid_terms) - 1)
     sel_term = st.selectbox("Select term for tier distribution", options=valid_terms or ["(none)"], index=idx)
-    fig_tier, tier_summary, tier_tbl = tier_stack_for_term(filtered_domain, filtered, sel_term) if valid_terms else (None, None, pd.DataFrame())
+    fig_tier, tier_summary, tier_tbl = tier_stack_for_term(filter_key, filtered_domain, sel_term) if valid_terms else (None, None, pd.DataFrame())
     if fig_tier is not None:
         st.plotly_chart(fig_tier, use_container_width=True)
         rec.add_fig(f"Tier_Distribution_{sel_term}", fig_tier)
@@ -536,13 +592,13 @@ else:
     c1, c2 = st.columns(2)
     with c1:
         split_year_sbj = st.toggle("Split Subjects by Year", value=(flt_year == "Both"), key="split_subj_year")
-        fig_sbj, subj_tbl = bar_by_category(filtered, "subject", split_by_year=split_year_sbj, title="Teaching Quality by Subject")
+        fig_sbj, subj_tbl = bar_by_category(filter_key, filtered, "subject", split_by_year=split_year_sbj, title="Teaching Quality by Subject")
         st.plotly_chart(fig_sbj, use_container_width=True)
         rec.add_fig("Subjects_by_Term_or_Year", fig_sbj)
         rec.add_table("Subjects_Summary", subj_tbl)
     with c2:
         split_year_grd = st.toggle("Split Grades by Year", value=(flt_year == "Both"), key="split_grade_year")
-        fig_grd, grade_tbl = bar_by_category(filtered, "grade", split_by_year=split_year_grd, title="Teaching Quality by Grade")
+        fig_grd, grade_tbl = bar_by_category(filter_key, filtered, "grade", split_by_year=split_year_grd, title="Teaching Quality by Grade")
         st.plotly_chart(fig_grd, use_container_width=True)
         rec.add_fig("Grades_by_Term_or_Year", fig_grd)
         rec.add_table("Grades_Summary", grade_tbl)
@@ -557,7 +613,7 @@ if filtered.empty:
 else:
     # Leaderboard tables (export-friendly, minimal interactivity)
     top_avg = (
-        filtered.groupby("fellow_name")["score"]
+        filtered.groupby("fellow_name", observed=True)["score"]
         .agg(avg_score="mean", n_obs="count").reset_index()
         .sort_values("avg_score", ascending=False).head(10)
     )
@@ -565,15 +621,20 @@ else:
     st.markdown("**🏆 Highest Average Scores (Top 10)**")
     st.dataframe(top_avg, use_container_width=True, hide_index=True)
 
-    improvements = []
-    for f in filtered["fellow_name"].unique():
-        fdf = filtered[filtered["fellow_name"] == f].sort_values("date_lesson_observed")
-        if len(fdf) >= 2:
-            first_s, last_s = float(fdf["score"].iloc[0]), float(fdf["score"].iloc[-1])
-            improvements.append((f, last_s - first_s, first_s, last_s, len(fdf)))
-    if improvements:
-        imp_df = pd.DataFrame(improvements, columns=["fellow_name", "improvement", "first", "latest", "n_obs"])\
-                 .sort_values("improvement", ascending=False).head(10)
+    # First/latest score per fellow from one date sort (drop_duplicates keeps NaN scores, like iloc did)
+    by_date = filtered.sort_values("date_lesson_observed", kind="stable")
+    first_s = by_date.drop_duplicates("fellow_name").set_index("fellow_name")["score"]
+    last_s = by_date.drop_duplicates("fellow_name", keep="last").set_index("fellow_name")["score"]
+    n_obs = by_date.groupby("fellow_name", observed=True).size()
+    n_obs = n_obs[n_obs >= 2]
+    if not n_obs.empty:
+        imp_df = pd.DataFrame({
+            "fellow_name": n_obs.index.astype(str),
+            "improvement": (last_s[n_obs.index] - first_s[n_obs.index]).to_numpy(dtype=float),
+            "first": first_s[n_obs.index].to_numpy(dtype=float),
+            "latest": last_s[n_obs.index].to_numpy(dtype=float),
+            "n_obs": n_obs.to_numpy(),
+        }).sort_values("improvement", ascending=False).head(10)
         rec.add_table("Fellows_Most_Improved", imp_df)
         st.markdown("**📈 Most Improved (Top 10)**")
         st.dataframe(imp_df, use_container_width=True, hide_index=True)
@@ -589,9 +650,10 @@ if filtered.empty:
     st.warning("No data available for selected filters.")
 else:
     # Compact record table (same as before, exportable)
+    # filtered_domain already holds only the filtered observations (see apply_filters)
     pivot = (
-        filtered_domain[filtered_domain["observation_id"].isin(filtered["observation_id"])]
-        .pivot_table(index="observation_id", columns="domain", values="score", aggfunc="mean")
+        filtered_domain
+        .pivot_table(index="observation_id", columns="domain", values="score", aggfunc="mean", observed=True, sort=False)
         .reset_index()
     )
     table_display = filtered.merge(pivot, on="observation_id", how="left")
@@ -623,12 +685,22 @@ with cA:
         mime="text/markdown", use_container_width=True
     )
 with cB:
-    st.download_button(
-        "Download Tables (CSV ZIP)",
-        data=rec.export_tables_zip(),
-        file_name=f"classroom_observations_tables_{datetime.now().strftime('%Y%m%d')}.zip",
-        mime="application/zip", use_container_width=True
+    # The CSV ZIP is only written on request; the bytes then live in session_state, tagged with the
+    # filter and view state they were built under, and are only offered while that state still matches
+    export_key = (
+        filter_key, tuple(rec.tables),
+        tuple(st.session_state.get(k) for k in ("split_domains_year", "split_subj_year", "split_grade_year")),
     )
+    if st.button("Prepare Tables (CSV ZIP)", use_container_width=True):
+        st.session_state["_obs_tables_zip"] = (export_key, rec.export_tables_zip())
+    prepared_key, prepared_zip = st.session_state.get("_obs_tables_zip", (None, None))
+    if prepared_key == export_key:
+        st.download_button(
+            "Download Tables (CSV ZIP)",
+            data=prepared_zip,
+            file_name=f"classroom_observations_tables_{datetime.now().strftime('%Y%m%d')}.zip",
+            mime="application/zip", use_container_width=True
+        )
 with cC:
     st.download_button(
         "Download Charts (PNG/HTML ZIP)",
@@ -1,45 +1,44 @@
+import numpy as np
 import pandas as pd
 
-def calculate_movements(df: pd.DataFrame, segment_col: str) -> pd.DataFrame:
-    """Calculate term-to-term movements for a domain/segment."""
-    movement_data = []
-
-    for domain in sorted(df['domain'].unique()):
-        domain_data = df[df['domain'] == domain].sort_values('term')
-
-        if segment_col and segment_col != "both":
-            for segment_val in sorted(domain_data[segment_col].unique()):
-                seg_data = domain_data[domain_data[segment_col] == segment_val]
-                _calculate_domain_movements(movement_data, seg_data, domain, segment_val)
-        else:
-            agg_data = domain_data.groupby('term').agg({
-                'tier_mix_t1_pct': 'mean',
-                'tier_mix_t2_pct': 'mean',
-                'tier_mix_t3_pct': 'mean',
-                'dominant_index': 'mean'
-            }).reset_index()
-            _calculate_domain_movements(movement_data, agg_data, domain)
-
-    return pd.DataFrame(movement_data)
-
+MIX_COLS = ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct', 'dominant_index']
 
-def _calculate_domain_movements(movement_data: list, data: pd.DataFrame, domain: str, segment_val: str = None):
-    terms = sorted(data['term'].unique())
 
-    for i in range(len(terms) - 1):
-        current_term = data[data['term'] == terms[i]].iloc[0]
-        next_term = data[data['term'] == terms[i + 1]].iloc[0]
-
-        t3_change = next_term['tier_mix_t3_pct'] - current_term['tier_mix_t3_pct']
-        index_change = next_term['dominant_index'] - current_term['dominant_index']
-
-        movement_type = "📈 Improvement" if t3_change > 2 else "📉 Decline" if t3_change < -2 else "➡️ Stable"
-
-        movement_data.append({
-            'Domain': domain,
-            'Segment': segment_val or 'Overall',
-            'Period': f"{terms[i]} → {terms[i+1]}",
-            'T3 Change': f"{t3_change:+.1f}%",
-            'Index Change': f"{index_change:+.2f}",
-            'Movement': movement_type
-        })
+def calculate_movements(df: pd.DataFrame, segment_col: str) -> pd.DataFrame:
+    """Calculate term-to-term movements for each domain (and segment) in one vectorised pass."""
+    if segment_col and segment_col != "both":
+        keys = ['domain', segment_col]
+        # One row per domain/segment/term; the first observation of a term wins
+        data = (
+            df.dropna(subset=[segment_col])
+              .sort_values(keys + ['term'], kind='stable')
+              .drop_duplicates(keys + ['term'])
+        )
+    else:
+        keys = ['domain']
+        data = (
+            df.groupby(['domain', 'term'], as_index=False, observed=True)[MIX_COLS].mean()
+              .sort_values(['domain', 'term'], kind='stable')
+        )
+
+    if data.empty:
+        return pd.DataFrame()
+
+    gb = data.groupby(keys, sort=False, observed=True)
+    prev = gb[['term', 'tier_mix_t3_pct', 'dominant_index']].shift(1)
+    has_prev = (gb.cumcount() > 0).to_numpy()
+    cur, prev = data[has_prev], prev[has_prev]
+
+    t3_change = cur['tier_mix_t3_pct'].to_numpy(dtype=float) - prev['tier_mix_t3_pct'].to_numpy(dtype=float)
+    index_change = cur['dominant_index'].to_numpy(dtype=float) - prev['dominant_index'].to_numpy(dtype=float)
+
+    return pd.DataFrame({
+        'Domain': cur['domain'].to_numpy(),
+        'Segment': cur[segment_col].to_numpy() if len(keys) > 1 else 'Overall',
+        'Period': prev['term'].astype(str).str.cat(cur['term'].astype(str), sep=" → ").to_numpy(),
+        'T3 Change': pd.Series(t3_change).map("{:+.1f}%".format).to_numpy(),
+        'Index Change': pd.Series(index_change).map("{:+.2f}".format).to_numpy(),
+        'Movement': np.select(
+            [t3_change > 2, t3_change < -2], ["📈 Improvement", "📉 Decline"], default="➡️ Stable"
+        ),
+    })
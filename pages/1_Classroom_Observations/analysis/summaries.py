@@ -24,29 +24,29 @@ def build_tier_mix_summary(df: pd.DataFrame, segment_col: str) -> pd.DataFrame:
 
 
 def _add_progression_row(summary_data: list, data: pd.DataFrame, domain: str, segment_val: str = None):
-    terms = sorted(data['term'].unique())
-
-    if len(terms) < 2:
+    # First row of each term, in term order, read out as plain arrays (no per-term mask or .iloc Series)
+    d = data.dropna(subset=['term']).sort_values('term', kind='stable').drop_duplicates('term')
+    if len(d) < 2:
         return
 
+    terms = d['term'].to_numpy()
+    t1 = d['tier_mix_t1_pct'].to_numpy()
+    t2 = d['tier_mix_t2_pct'].to_numpy()
+    t3 = d['tier_mix_t3_pct'].to_numpy()
+    idx = d['dominant_index'].to_numpy()
+
     row = {
         'Domain': domain,
         'Segment': segment_val or 'Overall'
     }
 
-    for term in terms:
-        term_data = data[data['term'] == term].iloc[0] if len(data[data['term'] == term]) > 0 else None
-        if term_data is not None:
-            row[f'{term} T1%'] = term_data['tier_mix_t1_pct']
-            row[f'{term} T2%'] = term_data['tier_mix_t2_pct']
-            row[f'{term} T3%'] = term_data['tier_mix_t3_pct']
-            row[f'{term} Index'] = term_data['dominant_index']
-
-    if len(terms) >= 2:
-        first_term = data[data['term'] == terms[0]].iloc[0]
-        last_term = data[data['term'] == terms[-1]].iloc[0]
+    for i, term in enumerate(terms):
+        row[f'{term} T1%'] = t1[i]
+        row[f'{term} T2%'] = t2[i]
+        row[f'{term} T3%'] = t3[i]
+        row[f'{term} Index'] = idx[i]
 
-        row['T3 Change'] = last_term['tier_mix_t3_pct'] - first_term['tier_mix_t3_pct']
-        row['Index Change'] = last_term['dominant_index'] - first_term['dominant_index']
+    row['T3 Change'] = t3[-1] - t3[0]
+    row['Index Change'] = idx[-1] - idx[0]
 
     summary_data.append(row)
@@ -25,128 +25,24 @@ import streamlit as st
 from ..analysis import summaries, movement
 
 
-def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_colors: dict):
-    """Tier distribution with option for stacked bar or panel view."""
- 
-    view_type = st.radio("Choose visualization style:", ["Stacked Bar", "Panels by Tier"], key="tier_dist_view")
-
-    # --- Aggregate data ---
-    if segment_col and segment_col != "both":
-        agg = (
-            df.groupby(['term', segment_col])[['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']]
-            .mean()
-            .reset_index()
-        )
-    else:
-        agg = (
-            df.groupby('term')[['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']]
-            .mean()
-            .reset_index()
-        )
-
-    # --- View A: Stacked Bar ---
-    if view_type == "Stacked Bar":
-        melt_df = agg.melt(
-            id_vars=['term'] + ([segment_col] if segment_col and segment_col != "both" else []),
-            value_vars=['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct'],
-            var_name='Tier',
-            value_name='Percentage'
-        )
-        melt_df['Tier'] = melt_df['Tier'].map({
-            'tier_mix_t1_pct': 'Tier 1',
-            'tier_mix_t2_pct': 'Tier 2',
-            'tier_mix_t3_pct': 'Tier 3'
-        })
-
-        fig = px.bar(
-            melt_df,
-            x="term",
-            y="Percentage",
-            color="Tier",
-            barmode="stack",
-            facet_col=segment_col if (segment_col and segment_col != "both") else None,
-            category_orders={"Tier": ["Tier 1", "Tier 2", "Tier 3"]},
-            title="Tier Mix Evolution (Stacked Bar)"
-        )
-
-        fig.update_layout(yaxis_title="Percentage", xaxis_title="Term", hovermode="x unified")
-        st.plotly_chart(fig, use_container_width=True)
-
-    # --- View B: Panels by Tier ---
-    else:
-        fig = make_subplots(
-            rows=1, cols=3,
-            subplot_titles=["Tier 1", "Tier 2", "Tier 3"],
-            shared_xaxes=True, shared_yaxes=True
-        )
-
-        tier_map = {
-            "Tier 1": "tier_mix_t1_pct",
-            "Tier 2": "tier_mix_t2_pct",
-            "Tier 3": "tier_mix_t3_pct"
-        }
-
-        for i, (tier_name, col) in enumerate(tier_map.items(), 1):
-            if segment_col and segment_col != "both":
-                for seg_val in sorted(agg[segment_col].unique()):
-                    seg_data = agg[agg[segment_col] == seg_val]
-                    fig.add_trace(
-                        go.Bar(
-                            x=seg_data['term'],
-                            y=seg_data[col],
-                            name=f"{tier_name} ({seg_val})",
-                            showlegend=(i == 1)
-                        ),
-                        row=1, col=i
-                    )
-            else:
-                fig.add_trace(
-                    go.Bar(
-                        x=agg['term'],
-                        y=agg[col],
-                        name=tier_name,
-                        showlegend=(i == 1)
-                    ),
-                    row=1, col=i
-                )
-
-        fig.update_layout(
-            title="Tier Distribution Panels",
-            yaxis_title="Percentage",
-            barmode="group"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-
 def create_dominant_index_chart(df: pd.DataFrame, segment_col: str, domain_colors: dict):
     """Create dominant index progression chart."""
-    fig = go.Figure()
-
-    if segment_col and segment_col != "both":
-        for segment_val in sorted(df[segment_col].unique()):
-            segment_data = df[df[segment_col] == segment_val]
-
-            for domain in sorted(segment_data['domain'].unique()):
-                domain_data = segment_data[segment_data['domain'] == domain]
-
-                fig.add_trace(go.Scatter(
-                    x=domain_data['term'],
-                    y=domain_data['dominant_index'],
-                    mode='lines+markers',
-                    name=f"{domain} ({segment_val})",
-                    line=dict(color=domain_colors.get(domain, '#888888'))
-                ))
-    else:
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain].groupby('term')['dominant_index'].mean().reset_index()
+    use_seg = bool(segment_col and segment_col != "both")
+    keys = ['term', 'domain'] + ([segment_col] if use_seg else [])
+    agg = (
+        df.groupby(keys, observed=True, sort=False)['dominant_index']
+        .mean()
+        .reset_index()
+        .sort_values(keys, ignore_index=True)
+    )
 
-            fig.add_trace(go.Scatter(
-                x=domain_data['term'],
-                y=domain_data['dominant_index'],
-                mode='lines+markers',
-                name=domain,
-                line=dict(color=domain_colors.get(domain, '#888888'))
-            ))
+    # One express call builds every domain (× segment) trace at once
+    fig = px.line(
+        agg, x='term', y='dominant_index',
+        color='domain', line_dash=segment_col if use_seg else None,
+        color_discrete_map=domain_colors, markers=True,
+        render_mode='webgl'
+    )
 
     fig.add_hline(y=2.0, line_dash="dash", line_color="gray", annotation_text="Balanced (2.0)")
     fig.add_hline(y=2.5, line_dash="dash", line_color="green", annotation_text="Strong (2.5)")
@@ -162,12 +58,48 @@ def create_dominant_index_chart(df: pd.DataFrame, segment_col: str, domain_color
 
 
 
+from types import MappingProxyType
+
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import streamlit as st
 
+TIER_COLS = ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']
+TIER_COLORS = MappingProxyType({'Tier 1': '#FF6B6B', 'Tier 2': '#4ECDC4', 'Tier 3': '#45B7D1'})
+_TIER_LABEL = {'tier_mix_t1_pct': 'Tier 1', 'tier_mix_t2_pct': 'Tier 2', 'tier_mix_t3_pct': 'Tier 3'}
+
+
+def _levels(s: pd.Series) -> list:
+    """Sorted distinct values; categoricals read them off the category index instead of hashing strings."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return list(s.cat.remove_unused_categories().cat.categories)
+    return sorted(s.dropna().unique())
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _tier_aggregates(df: pd.DataFrame, segment_col: str):
+    """
+    Return (segment_avg, agg_df) from one groupby over the raw rows.
+    agg_df holds means per term[/segment]/domain; segment_avg rolls the same
+    sums and counts up to term[/segment], so it still equals the row-level mean.
+    """
+    keys = ['term'] + ([segment_col] if segment_col and segment_col != "both" else [])
+    # float32 is plenty for 0–100 percentages; no-op when the loader already downcast
+    df = df.astype({col: 'float32' for col in TIER_COLS})
+    grouped = df.groupby(keys + ['domain'], observed=True, sort=False)[TIER_COLS]
+    sums, counts = grouped.sum(), grouped.count()
+
+    # Groups come out unsorted; order only the small aggregates so line traces run term by term
+    agg_df = (sums / counts).reset_index().sort_values(keys + ['domain'], ignore_index=True)
+    segment_avg = (
+        sums.groupby(level=keys, observed=True, sort=False).sum()
+        / counts.groupby(level=keys, observed=True, sort=False).sum()
+    ).reset_index().sort_values(keys, ignore_index=True)
+    return segment_avg, agg_df
+
+
 def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_colors: dict):
     """Enhanced tier distribution with multiple visualization options for comparing segments."""
     
@@ -178,7 +110,7 @@ def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_co
     with col1:
         viz_type = st.selectbox(
             "Visualization Type:",
-            ["Multi-Panel Comparison", "Stacked Area", "Side-by-Side Bars", "Heatmap Matrix"],
+            ["Multi-Panel Comparison", "Stacked Area", "Stacked Bar", "Side-by-Side Bars", "Heatmap Matrix"],
             key="tier_viz_type"
         )
     
@@ -189,53 +121,36 @@ def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_co
             key="tier_focus"
         )
     
-    # Data aggregation
-    if segment_col and segment_col != "both":
-        # Group by term and segment
-        agg_df = (
-            df.groupby(['term', segment_col, 'domain'])[
-                ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']
-            ].mean().reset_index()
-        )
-        
-        # Overall segment averages
-        segment_avg = (
-            df.groupby(['term', segment_col])[
-                ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']
-            ].mean().reset_index()
-        )
-    else:
-        # Overall averages only
-        agg_df = (
-            df.groupby(['term', 'domain'])[
-                ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']
-            ].mean().reset_index()
-        )
-        segment_avg = (
-            df.groupby('term')[
-                ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']
-            ].mean().reset_index()
-        )
+    # Data aggregation (cached: the selectboxes above only change the view, not the numbers)
+    segment_avg, agg_df = _tier_aggregates(df, segment_col)
     
-    # Render based on selected visualization
+    # Build (cached per selection + data) based on selected visualization
+    fig = None
     if viz_type == "Multi-Panel Comparison":
-        render_multi_panel_comparison(segment_avg, agg_df, segment_col, focus_tier, domain_colors)
+        fig = render_multi_panel_comparison(segment_avg, agg_df, segment_col, focus_tier, domain_colors)
     
     elif viz_type == "Stacked Area":
-        render_stacked_area(segment_avg, segment_col, focus_tier)
+        fig = render_stacked_area(segment_avg, segment_col, focus_tier)
+    
+    elif viz_type == "Stacked Bar":
+        fig = render_stacked_bar(segment_avg, segment_col)
     
     elif viz_type == "Side-by-Side Bars":
-        render_side_by_side_bars(segment_avg, agg_df, segment_col, focus_tier, domain_colors)
+        fig = render_side_by_side_bars(segment_avg, agg_df, segment_col, focus_tier, domain_colors)
     
     elif viz_type == "Heatmap Matrix":
-        render_heatmap_matrix(agg_df, segment_col, focus_tier)
+        fig = render_heatmap_matrix(agg_df, segment_col, focus_tier)
+    
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
 
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
 def render_multi_panel_comparison(segment_avg, agg_df, segment_col, focus_tier, domain_colors):
     """Multi-panel view comparing segments and showing domain breakdown."""
     
     if segment_col and segment_col != "both":
         # Create panels for each segment
-        segments = sorted(segment_avg[segment_col].unique())
+        segments = _levels(segment_avg[segment_col])
         fig = make_subplots(
             rows=len(segments), cols=2,
             subplot_titles=[f"{seg} - Overall" for seg in segments] + 
@@ -245,47 +160,51 @@ def render_multi_panel_comparison(segment_avg, agg_df, segment_col, focus_tier,
             horizontal_spacing=0.1
         )
         
-        tier_colors = {'Tier 1': '#FF6B6B', 'Tier 2': '#4ECDC4', 'Tier 3': '#45B7D1'}
+        # Split once; the loops below look subsets up instead of re-masking per segment/domain
+        seg_groups = dict(iter(segment_avg.groupby(segment_col, observed=True, sort=True)))
+        dom_groups = dict(iter(agg_df.groupby([segment_col, 'domain'], observed=True, sort=True)))
+        domains = _levels(agg_df['domain'])
         
         for i, segment_val in enumerate(segments, 1):
-            segment_data = segment_avg[segment_avg[segment_col] == segment_val]
-            domain_data = agg_df[agg_df[segment_col] == segment_val]
+            segment_data = seg_groups[segment_val]
             
             # Left panel: Overall segment trends
             if focus_tier == "All Tiers":
-                for tier, col, color in [('Tier 1', 'tier_mix_t1_pct', tier_colors['Tier 1']),
-                                       ('Tier 2', 'tier_mix_t2_pct', tier_colors['Tier 2']),
-                                       ('Tier 3', 'tier_mix_t3_pct', tier_colors['Tier 3'])]:
+                for tier, col, color in [('Tier 1', 'tier_mix_t1_pct', TIER_COLORS['Tier 1']),
+                                       ('Tier 2', 'tier_mix_t2_pct', TIER_COLORS['Tier 2']),
+                                       ('Tier 3', 'tier_mix_t3_pct', TIER_COLORS['Tier 3'])]:
                     fig.add_trace(
-                        go.Scatter(x=segment_data['term'], y=segment_data[col],
+                        go.Scattergl(x=segment_data['term'], y=segment_data[col],
                                  mode='lines+markers', name=f"{tier} ({segment_val})",
                                  line=dict(color=color), showlegend=(i==1)),
                         row=i, col=1
                     )
             elif focus_tier == "Tier 3 Only":
                 fig.add_trace(
-                    go.Scatter(x=segment_data['term'], y=segment_data['tier_mix_t3_pct'],
+                    go.Scattergl(x=segment_data['term'], y=segment_data['tier_mix_t3_pct'],
                              mode='lines+markers', name=f"Tier 3 ({segment_val})",
-                             line=dict(color=tier_colors['Tier 3']), showlegend=(i==1)),
+                             line=dict(color=TIER_COLORS['Tier 3']), showlegend=(i==1)),
                     row=i, col=1
                 )
             else:  # Tier 1 vs Tier 3
                 fig.add_trace(
-                    go.Scatter(x=segment_data['term'], y=segment_data['tier_mix_t1_pct'],
+                    go.Scattergl(x=segment_data['term'], y=segment_data['tier_mix_t1_pct'],
                              mode='lines+markers', name=f"Tier 1 ({segment_val})",
-                             line=dict(color=tier_colors['Tier 1']), showlegend=(i==1)),
+                             line=dict(color=TIER_COLORS['Tier 1']), showlegend=(i==1)),
                     row=i, col=1
                 )
                 fig.add_trace(
-                    go.Scatter(x=segment_data['term'], y=segment_data['tier_mix_t3_pct'],
+                    go.Scattergl(x=segment_data['term'], y=segment_data['tier_mix_t3_pct'],
                              mode='lines+markers', name=f"Tier 3 ({segment_val})",
-                             line=dict(color=tier_colors['Tier 3']), showlegend=(i==1)),
+                             line=dict(color=TIER_COLORS['Tier 3']), showlegend=(i==1)),
                     row=i, col=1
                 )
             
             # Right panel: Domain breakdown
-            for domain in sorted(domain_data['domain'].unique()):
-                domain_subset = domain_data[domain_data['domain'] == domain]
+            for domain in domains:
+                domain_subset = dom_groups.get((segment_val, domain))
+                if domain_subset is None:
+                    continue
                 
                 if focus_tier == "Tier 3 Only":
                     y_col = 'tier_mix_t3_pct'
@@ -295,7 +214,7 @@ def render_multi_panel_comparison(segment_avg, agg_df, segment_col, focus_tier,
                     y_col = 'tier_mix_t3_pct'  # Default to tier 3 for clarity
                 
                 fig.add_trace(
-                    go.Scatter(x=domain_subset['term'], y=domain_subset[y_col],
+                    go.Scattergl(x=domain_subset['term'], y=domain_subset[y_col],
                              mode='lines+markers', name=f"{domain} ({segment_val})",
                              line=dict(color=domain_colors.get(domain, '#888888')),
                              showlegend=(i==1)),
@@ -311,60 +230,61 @@ def render_multi_panel_comparison(segment_avg, agg_df, segment_col, focus_tier,
     else:
         # Single overall view
         fig = go.Figure()
-        tier_colors = {'Tier 1': '#FF6B6B', 'Tier 2': '#4ECDC4', 'Tier 3': '#45B7D1'}
-        
         if focus_tier == "All Tiers":
-            for tier, col, color in [('Tier 1', 'tier_mix_t1_pct', tier_colors['Tier 1']),
-                                   ('Tier 2', 'tier_mix_t2_pct', tier_colors['Tier 2']),
-                                   ('Tier 3', 'tier_mix_t3_pct', tier_colors['Tier 3'])]:
+            for tier, col, color in [('Tier 1', 'tier_mix_t1_pct', TIER_COLORS['Tier 1']),
+                                   ('Tier 2', 'tier_mix_t2_pct', TIER_COLORS['Tier 2']),
+                                   ('Tier 3', 'tier_mix_t3_pct', TIER_COLORS['Tier 3'])]:
                 fig.add_trace(
-                    go.Scatter(x=segment_avg['term'], y=segment_avg[col],
+                    go.Scattergl(x=segment_avg['term'], y=segment_avg[col],
                              mode='lines+markers', name=tier, line=dict(color=color))
                 )
         elif focus_tier == "Tier 3 Only":
             fig.add_trace(
-                go.Scatter(x=segment_avg['term'], y=segment_avg['tier_mix_t3_pct'],
+                go.Scattergl(x=segment_avg['term'], y=segment_avg['tier_mix_t3_pct'],
                          mode='lines+markers', name="Tier 3",
-                         line=dict(color=tier_colors['Tier 3']))
+                         line=dict(color=TIER_COLORS['Tier 3']))
             )
         
         fig.update_layout(title="Overall Tier Distribution Trends")
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
 def render_stacked_area(segment_avg, segment_col, focus_tier):
     """Stacked area chart showing tier composition over time."""
     
     if segment_col and segment_col != "both":
+        segments = _levels(segment_avg[segment_col])
         fig = make_subplots(
-            rows=1, cols=len(segment_avg[segment_col].unique()),
-            subplot_titles=[f"{seg}" for seg in sorted(segment_avg[segment_col].unique())],
+            rows=1, cols=len(segments),
+            subplot_titles=[f"{seg}" for seg in segments],
             shared_yaxes=True
         )
         
-        for i, segment_val in enumerate(sorted(segment_avg[segment_col].unique()), 1):
-            segment_data = segment_avg[segment_avg[segment_col] == segment_val]
+        seg_groups = dict(iter(segment_avg.groupby(segment_col, observed=True, sort=True)))
+        
+        for i, segment_val in enumerate(segments, 1):
+            segment_data = seg_groups[segment_val]
             
             if focus_tier == "All Tiers":
-                # Stacked area for all tiers
+                # Stacked area for all tiers: running T1, T1+T2, T1+T2+T3 in one pass
+                cum = segment_data[TIER_COLS].to_numpy().cumsum(axis=1)
                 fig.add_trace(
-                    go.Scatter(x=segment_data['term'], y=segment_data['tier_mix_t1_pct'],
+                    go.Scatter(x=segment_data['term'], y=cum[:, 0],
                              mode='lines', fill='tonexty' if i>1 else 'tozeroy',
-                             name=f"Tier 1", line=dict(color='#FF6B6B'), showlegend=(i==1)),
+                             name=f"Tier 1", line=dict(color=TIER_COLORS['Tier 1']), showlegend=(i==1)),
                     row=1, col=i
                 )
                 fig.add_trace(
-                    go.Scatter(x=segment_data['term'], 
-                             y=segment_data['tier_mix_t1_pct'] + segment_data['tier_mix_t2_pct'],
+                    go.Scatter(x=segment_data['term'], y=cum[:, 1],
                              mode='lines', fill='tonexty',
-                             name=f"Tier 2", line=dict(color='#4ECDC4'), showlegend=(i==1)),
+                             name=f"Tier 2", line=dict(color=TIER_COLORS['Tier 2']), showlegend=(i==1)),
                     row=1, col=i
                 )
                 fig.add_trace(
-                    go.Scatter(x=segment_data['term'], 
-                             y=segment_data['tier_mix_t1_pct'] + segment_data['tier_mix_t2_pct'] + segment_data['tier_mix_t3_pct'],
+                    go.Scatter(x=segment_data['term'], y=cum[:, 2],
                              mode='lines', fill='tonexty',
-                             name=f"Tier 3", line=dict(color='#45B7D1'), showlegend=(i==1)),
+                             name=f"Tier 3", line=dict(color=TIER_COLORS['Tier 3']), showlegend=(i==1)),
                     row=1, col=i
                 )
             else:
@@ -372,7 +292,7 @@ def render_stacked_area(segment_avg, segment_col, focus_tier):
                 fig.add_trace(
                     go.Scatter(x=segment_data['term'], y=segment_data['tier_mix_t3_pct'],
                              mode='lines+markers', fill='tozeroy',
-                             name=f"Tier 3", line=dict(color='#45B7D1'), showlegend=(i==1)),
+                             name=f"Tier 3", line=dict(color=TIER_COLORS['Tier 3']), showlegend=(i==1)),
                     row=1, col=i
                 )
         
@@ -383,28 +303,50 @@ def render_stacked_area(segment_avg, segment_col, focus_tier):
         fig = go.Figure()
         
         if focus_tier == "All Tiers":
+            cum = segment_avg[TIER_COLS].to_numpy().cumsum(axis=1)
             fig.add_trace(go.Scatter(
-                x=segment_avg['term'], y=segment_avg['tier_mix_t1_pct'],
+                x=segment_avg['term'], y=cum[:, 0],
                 mode='lines', fill='tozeroy', name='Tier 1',
-                line=dict(color='#FF6B6B')
+                line=dict(color=TIER_COLORS['Tier 1'])
             ))
             fig.add_trace(go.Scatter(
-                x=segment_avg['term'], 
-                y=segment_avg['tier_mix_t1_pct'] + segment_avg['tier_mix_t2_pct'],
+                x=segment_avg['term'], y=cum[:, 1],
                 mode='lines', fill='tonexty', name='Tier 2',
-                line=dict(color='#4ECDC4')
+                line=dict(color=TIER_COLORS['Tier 2'])
             ))
             fig.add_trace(go.Scatter(
-                x=segment_avg['term'], 
-                y=segment_avg['tier_mix_t1_pct'] + segment_avg['tier_mix_t2_pct'] + segment_avg['tier_mix_t3_pct'],
+                x=segment_avg['term'], y=cum[:, 2],
                 mode='lines', fill='tonexty', name='Tier 3',
-                line=dict(color='#45B7D1')
+                line=dict(color=TIER_COLORS['Tier 3'])
             ))
         
         fig.update_layout(title="Overall Tier Composition")
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def render_stacked_bar(segment_avg, segment_col):
+    """Stacked bar of the full tier mix per term, faceted by segment when one is selected."""
+    
+    has_segment = bool(segment_col and segment_col != "both")
+    melt_df = segment_avg.melt(
+        id_vars=['term'] + ([segment_col] if has_segment else []),
+        value_vars=TIER_COLS,
+        var_name='Tier', value_name='Percentage'
+    )
+    melt_df['Tier'] = melt_df['Tier'].map(_TIER_LABEL)
+    
+    fig = px.bar(
+        melt_df, x='term', y='Percentage', color='Tier', barmode='stack',
+        facet_col=segment_col if has_segment else None,
+        category_orders={"Tier": ["Tier 1", "Tier 2", "Tier 3"]},
+        title="Tier Mix Evolution (Stacked Bar)"
+    )
+    fig.update_layout(yaxis_title="Percentage", xaxis_title="Term", hovermode="x unified")
+    
+    return fig
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
 def render_side_by_side_bars(segment_avg, agg_df, segment_col, focus_tier, domain_colors):
     """Side-by-side bar comparison of segments."""
     
@@ -416,7 +358,7 @@ def render_side_by_side_bars(segment_avg, agg_df, segment_col, focus_tier, domai
                 value_vars=['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct'],
                 var_name='Tier', value_name='Percentage'
             )
-            melt_df['Tier'] = melt_df['Tier'].str.replace('tier_mix_', '').str.replace('_pct', '').str.title()
+            melt_df['Tier'] = melt_df['Tier'].map(_TIER_LABEL)
             
             fig = px.bar(
                 melt_df, x='term', y='Percentage', color='Tier',
@@ -440,7 +382,7 @@ def render_side_by_side_bars(segment_avg, agg_df, segment_col, focus_tier, domai
                     value_vars=['tier_mix_t1_pct', 'tier_mix_t3_pct'],
                     var_name='Tier', value_name='Percentage'
                 )
-                melt_df['Tier'] = melt_df['Tier'].str.replace('tier_mix_', '').str.replace('_pct', '').str.title()
+                melt_df['Tier'] = melt_df['Tier'].map(_TIER_LABEL)
                 
                 fig = px.bar(
                     melt_df, x='term', y='Percentage', color='Tier',
@@ -448,22 +390,22 @@ def render_side_by_side_bars(segment_avg, agg_df, segment_col, focus_tier, domai
                     title=f"Tier 1 vs Tier 3 by {segment_col.replace('_', ' ').title()}"
                 )
         
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
 
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
 def render_heatmap_matrix(agg_df, segment_col, focus_tier):
-    """Heatmap showing tier performance across domains and segments."""
+    """Heatmap showing tier performance across domains and segments (pivoted from the term/segment/domain means)."""
     
     if segment_col and segment_col != "both":
         # Create pivot for heatmap
         y_col = 'tier_mix_t3_pct' if focus_tier != "Tier 1 vs Tier 3" else 'tier_mix_t3_pct'
         
         # Latest term data for heatmap
-        latest_term = agg_df['term'].max()
-        heatmap_data = agg_df[agg_df['term'] == latest_term]
-        
-        pivot_df = heatmap_data.pivot_table(
-            index='domain', columns=segment_col, values=y_col, fill_value=0
-        )
+        latest_term = _levels(agg_df['term'])[-1]
+        # agg_df already holds one mean per term/segment/domain, so this is a reshape
+        pivot_df = agg_df.loc[agg_df['term'] == latest_term].pivot(
+            index='domain', columns=segment_col, values=y_col
+        ).fillna(0)
         
         fig = go.Figure(data=go.Heatmap(
             z=pivot_df.values,
@@ -479,7 +421,7 @@ def render_heatmap_matrix(agg_df, segment_col, focus_tier):
             yaxis_title="Domain"
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
 
 # Usage example
 def example_usage():
@@ -15,13 +15,13 @@ def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_co
     # --- Aggregate data ---
     if segment_col and segment_col != "both":
         agg = (
-            df.groupby(['term', segment_col])[['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']]
+            df.groupby(['term', segment_col], observed=True)[['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']]
             .mean()
             .reset_index()
         )
     else:
         agg = (
-            df.groupby('term')[['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']]
+            df.groupby('term', observed=True)[['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct']]
             .mean()
             .reset_index()
         )
@@ -51,7 +51,10 @@ def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_co
             title="Tier Mix Evolution (Stacked Bar)"
         )
 
-        fig.update_layout(yaxis_title="Percentage", xaxis_title="Term", hovermode="x unified")
+        fig.update_layout(
+            yaxis_title="Percentage", xaxis_title="Term", hovermode="x unified",
+            uirevision='tier', transition_duration=0,
+        )
         st.plotly_chart(fig, use_container_width=True)
 
     # --- View B: Panels by Tier ---
@@ -68,34 +71,29 @@ def create_tier_distribution_chart(df: pd.DataFrame, segment_col: str, domain_co
             "Tier 3": "tier_mix_t3_pct"
         }
 
+        # Collect every panel's bars and hand them to plotly in one add_traces call
+        if segment_col and segment_col != "both":
+            groups = [(f" ({seg_val})", seg_data) for seg_val, seg_data in agg.groupby(segment_col, observed=True)]
+        else:
+            groups = [("", agg)]
+
+        traces, cols = [], []
         for i, (tier_name, col) in enumerate(tier_map.items(), 1):
-            if segment_col and segment_col != "both":
-                for seg_val in sorted(agg[segment_col].unique()):
-                    seg_data = agg[agg[segment_col] == seg_val]
-                    fig.add_trace(
-                        go.Bar(
-                            x=seg_data['term'],
-                            y=seg_data[col],
-                            name=f"{tier_name} ({seg_val})",
-                            showlegend=(i == 1)
-                        ),
-                        row=1, col=i
-                    )
-            else:
-                fig.add_trace(
-                    go.Bar(
-                        x=agg['term'],
-                        y=agg[col],
-                        name=tier_name,
-                        showlegend=(i == 1)
-                    ),
-                    row=1, col=i
-                )
+            for suffix, data in groups:
+                traces.append(go.Bar(
+                    x=data['term'],
+                    y=data[col],
+                    name=f"{tier_name}{suffix}",
+                    showlegend=(i == 1)
+                ))
+                cols.append(i)
+        fig.add_traces(traces, rows=[1] * len(traces), cols=cols)
 
         fig.update_layout(
             title="Tier Distribution Panels",
             yaxis_title="Percentage",
-            barmode="group"
+            barmode="group",
+            uirevision='tier', transition_duration=0,
         )
         st.plotly_chart(fig, use_container_width=True)
 
@@ -104,31 +102,20 @@ def create_dominant_index_chart(df: pd.DataFrame, segment_col: str, domain_color
     """Create dominant index progression chart."""
     fig = go.Figure()
 
-    if segment_col and segment_col != "both":
-        for segment_val in sorted(df[segment_col].unique()):
-            segment_data = df[df[segment_col] == segment_val]
-
-            for domain in sorted(segment_data['domain'].unique()):
-                domain_data = segment_data[segment_data['domain'] == domain]
-
-                fig.add_trace(go.Scatter(
-                    x=domain_data['term'],
-                    y=domain_data['dominant_index'],
-                    mode='lines+markers',
-                    name=f"{domain} ({segment_val})",
-                    line=dict(color=domain_colors.get(domain, '#888888'))
-                ))
-    else:
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain].groupby('term')['dominant_index'].mean().reset_index()
-
-            fig.add_trace(go.Scatter(
-                x=domain_data['term'],
-                y=domain_data['dominant_index'],
-                mode='lines+markers',
-                name=domain,
-                line=dict(color=domain_colors.get(domain, '#888888'))
-            ))
+    # One hash pass: mean index per (segment,) domain, term; then one trace per (segment,) domain
+    seg = [segment_col] if segment_col and segment_col != "both" else []
+    grouped = df.groupby(seg + ['domain', 'term'], observed=True)['dominant_index'].mean().reset_index()
+
+    for key, domain_data in grouped.groupby(seg + ['domain'], observed=True, sort=False):
+        keys = key if isinstance(key, tuple) else (key,)
+        domain = keys[-1]
+        fig.add_trace(go.Scattergl(
+            x=domain_data['term'],
+            y=domain_data['dominant_index'],
+            mode='lines+markers',
+            name=f"{domain} ({keys[0]})" if seg else domain,
+            line=dict(color=domain_colors.get(domain, '#888888'))
+        ))
 
     fig.add_hline(y=2.0, line_dash="dash", line_color="gray", annotation_text="Balanced (2.0)")
     fig.add_hline(y=2.5, line_dash="dash", line_color="green", annotation_text="Strong (2.5)")
@@ -137,7 +124,8 @@ def create_dominant_index_chart(df: pd.DataFrame, segment_col: str, domain_color
         title="Dominant Index Evolution (Higher = Better Tier Distribution)",
         xaxis_title="Term",
         yaxis_title="Dominant Index",
-        yaxis=dict(range=[1.0, 3.0])
+        yaxis=dict(range=[1.0, 3.0]),
+        uirevision='tier', transition_duration=0,
     )
 
     st.plotly_chart(fig, use_container_width=True)
@@ -128,7 +128,6 @@ def render_strategic_section(df: pd.DataFrame, segment_col: str, domain_colors:
 
 # enhanced_tier_analysis/sections/tier_mix_section.py
 import re
-import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -179,45 +178,47 @@ def render_tier_mix_section(df: pd.DataFrame, segment_col: str, domain_colors: d
 # =========================
 # Style (minimalist)
 # =========================
+_CSS_BLOCK = """
+<style>
+    .ttn-section-title{
+        margin: 0.25rem 0 1rem 0;
+        color: #1F2A37;
+        font-weight: 700;
+        letter-spacing: 0.2px;
+    }
+    .ttn-subtitle{
+        margin: 1.25rem 0 0.5rem 0;
+        color: #111827;
+        font-weight: 600;
+    }
+    .ttn-card{
+        padding: 12px 16px;
+        border-radius: 10px;
+        border: 1px solid #E5E7EB;
+        background: #FFFFFF;
+        box-shadow: 0 1px 2px rgba(0,0,0,0.03);
+        margin-bottom: 8px;
+    }
+    .ttn-kpi .metric-container { gap: 10px; }
+    .ttn-insight{
+        padding: 12px 16px;
+        border-left: 5px solid #94A3B8;
+        background: #F8FAFC;
+        border-radius: 6px;
+        margin: 6px 0;
+    }
+    .ttn-insight.success{ border-left-color:#10B981; background:#ECFDF5; }
+    .ttn-insight.danger{  border-left-color:#EF4444; background:#FEF2F2; }
+    .ttn-insight.info{    border-left-color:#0EA5E9; background:#EFF6FF; }
+    .ttn-insight.warning{ border-left-color:#F59E0B; background:#FFFBEB; }
+</style>
+"""
+
+
 def _inject_css():
-    st.markdown(
-        """
-        <style>
-            .ttn-section-title{
-                margin: 0.25rem 0 1rem 0;
-                color: #1F2A37;
-                font-weight: 700;
-                letter-spacing: 0.2px;
-            }
-            .ttn-subtitle{
-                margin: 1.25rem 0 0.5rem 0;
-                color: #111827;
-                font-weight: 600;
-            }
-            .ttn-card{
-                padding: 12px 16px;
-                border-radius: 10px;
-                border: 1px solid #E5E7EB;
-                background: #FFFFFF;
-                box-shadow: 0 1px 2px rgba(0,0,0,0.03);
-                margin-bottom: 8px;
-            }
-            .ttn-kpi .metric-container { gap: 10px; }
-            .ttn-insight{
-                padding: 12px 16px;
-                border-left: 5px solid #94A3B8;
-                background: #F8FAFC;
-                border-radius: 6px;
-                margin: 6px 0;
-            }
-            .ttn-insight.success{ border-left-color:#10B981; background:#ECFDF5; }
-            .ttn-insight.danger{  border-left-color:#EF4444; background:#FEF2F2; }
-            .ttn-insight.info{    border-left-color:#0EA5E9; background:#EFF6FF; }
-            .ttn-insight.warning{ border-left-color:#F59E0B; background:#FFFBEB; }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+    # Streamlit drops elements a rerun doesn't emit, so the block is re-sent each run;
+    # keeping it a module constant means no per-run string building.
+    st.markdown(_CSS_BLOCK, unsafe_allow_html=True)
 
 
 # =========================
@@ -388,12 +389,15 @@ def _analyze_progression_patterns(df: pd.DataFrame, terms: list):
 
 def _identify_patterns(df: pd.DataFrame, terms: list):
     st.write("**📊 Pattern Analysis**")
-    for domain in sorted(df["domain"].unique()):
-        vals = []
-        for t in terms[:3]:  # first 3 terms for simple pattern read
-            v = df[(df["term"] == t) & (df["domain"] == domain)]["tier_mix_t3_pct"].mean()
-            vals.append(v if not np.isnan(v) else None)
-        if any(v is None for v in vals) or len(vals) < 3:
+    # Domain x term T3 means for the first 3 terms in one groupby (simple pattern read)
+    t3_means = (
+        df[df["term"].isin(terms[:3])]
+        .groupby(["domain", "term"], observed=True)["tier_mix_t3_pct"].mean()
+        .unstack()
+        .reindex(columns=terms[:3])
+    )
+    for domain, vals in t3_means.iterrows():
+        if vals.isna().any() or len(vals) < 3:
             continue
 
         t1, t2, t3 = vals
@@ -5,6 +5,25 @@ import streamlit as st
 
 from ..analysis import summaries, movement
 
+_TERM_NUM = re.compile(r"\d+")
+
+# Short and display names for movement.MIX_COLS, applied after one block-wise groupby mean
+_MIX_SHORT = {"tier_mix_t1_pct": "t1", "tier_mix_t2_pct": "t2", "tier_mix_t3_pct": "t3", "dominant_index": "idx"}
+_MIX_LABELS = {"tier_mix_t1_pct": "Tier 1%", "tier_mix_t2_pct": "Tier 2%", "tier_mix_t3_pct": "Tier 3%", "dominant_index": "Index"}
+
+
+def _term_key(t: str) -> int:
+    """Sort terms numerically if labeled like "Term 1", "Term 2", ..."""
+    m = _TERM_NUM.search(str(t))
+    return int(m.group()) if m else 0
+
+
+def _ordered_terms(terms: pd.Series) -> list:
+    """Distinct terms in numeric order; categoricals read them off the category index."""
+    if isinstance(terms.dtype, pd.CategoricalDtype):
+        return sorted(terms.cat.remove_unused_categories().cat.categories, key=_term_key)
+    return sorted(terms.dropna().unique(), key=_term_key)
+
 
 # ---------- Tier Mix Analysis (SPLIT BY TERM) ----------
 def create_tier_mix_table(df: pd.DataFrame, segment_col: str):
@@ -24,12 +43,7 @@ def create_tier_mix_table(df: pd.DataFrame, segment_col: str):
         st.warning(f"Missing columns for Tier Mix Analysis: {', '.join(missing)}")
         return
 
-    # Sort terms numerically if labeled like "Term 1", "Term 2", ...
-    def _term_key(t: str) -> int:
-        m = re.search(r"\d+", str(t))
-        return int(m.group()) if m else 0
-
-    terms = sorted(df["term"].dropna().unique(), key=_term_key)
+    terms = _ordered_terms(df["term"])
     if not terms:
         st.info("No terms found.")
         return
@@ -64,20 +78,22 @@ def create_tier_mix_table(df: pd.DataFrame, segment_col: str):
                 fmt[c] = "{:.2f}"
         return fmt
 
+    # Split rows by term in one pass instead of a mask per term
+    by_term = dict(iter(df.groupby("term", observed=True)))
+
     def _term_subtable(term_value: str) -> pd.DataFrame:
         """Build a single term subtable (optionally segmented)."""
-        subset = df[df["term"] == term_value]
-        if subset.empty:
+        subset = by_term.get(term_value)
+        if subset is None or subset.empty:
             return pd.DataFrame()
 
         # Aggregate: per domain (and per segment, if specified)
         if segment_col and segment_col != "both" and segment_col in subset.columns:
-            grp = subset.groupby(["domain", segment_col]).agg(
-                t1=("tier_mix_t1_pct", "mean"),
-                t2=("tier_mix_t2_pct", "mean"),
-                t3=("tier_mix_t3_pct", "mean"),
-                idx=("dominant_index", "mean"),
-            ).round(1)
+            grp = (
+                subset.groupby(["domain", segment_col], observed=True)[movement.MIX_COLS].mean()
+                .rename(columns=_MIX_SHORT)
+                .round(1)
+            )
 
             # Pivot to columns like "<segment> Tier 1%", "<segment> Tier 2%", ...
             wide = grp.unstack(segment_col)
@@ -103,14 +119,11 @@ def create_tier_mix_table(df: pd.DataFrame, segment_col: str):
 
         else:
             # Overall (no segmentation)
-            wide = subset.groupby("domain").agg(
-                **{
-                    "Tier 1%": ("tier_mix_t1_pct", "mean"),
-                    "Tier 2%": ("tier_mix_t2_pct", "mean"),
-                    "Tier 3%": ("tier_mix_t3_pct", "mean"),
-                    "Index": ("dominant_index", "mean"),
-                }
-            ).round(1)
+            wide = (
+                subset.groupby("domain", observed=True)[movement.MIX_COLS].mean()
+                .rename(columns=_MIX_LABELS)
+                .round(1)
+            )
 
             # Sort by Tier 3 desc
             if "Tier 3%" in wide.columns:
@@ -222,11 +235,7 @@ def show_domain_performance_table(df: pd.DataFrame, segment_col: str, tier_focus
         st.info("No data for domain summary.")
         return
 
-    def _term_sort_key(t: str) -> int:
-        m = re.search(r"\d+", str(t))
-        return int(m.group()) if m else 0
-
-    terms = sorted(df["term"].dropna().unique(), key=_term_sort_key)
+    terms = _ordered_terms(df["term"])
     if not terms:
         st.info("No terms found.")
         return
@@ -240,28 +249,16 @@ def show_domain_performance_table(df: pd.DataFrame, segment_col: str, tier_focus
     # Overall or segmented
     if segment_col and segment_col != "both" and segment_col in df.columns:
         summary = (
-            latest_df.groupby(["domain", segment_col])
-            .agg(
-                t1=("tier_mix_t1_pct", "mean"),
-                t2=("tier_mix_t2_pct", "mean"),
-                t3=("tier_mix_t3_pct", "mean"),
-                idx=("dominant_index", "mean"),
-            )
+            latest_df.groupby(["domain", segment_col], observed=True)[movement.MIX_COLS].mean()
+            .rename(columns=_MIX_SHORT)
             .round(1)
         ).unstack(segment_col)
         summary.columns = [f"{seg} {m}".replace("t1", "Tier 1%").replace("t2", "Tier 2%").replace("t3", "Tier 3%").replace("idx", "Index")
                            for (m, seg) in summary.columns]
     else:
         summary = (
-            latest_df.groupby("domain")
-            .agg(
-                **{
-                    "Tier 1%": ("tier_mix_t1_pct", "mean"),
-                    "Tier 2%": ("tier_mix_t2_pct", "mean"),
-                    "Tier 3%": ("tier_mix_t3_pct", "mean"),
-                    "Index": ("dominant_index", "mean"),
-                }
-            )
+            latest_df.groupby("domain", observed=True)[movement.MIX_COLS].mean()
+            .rename(columns=_MIX_LABELS)
             .round(1)
         )
 
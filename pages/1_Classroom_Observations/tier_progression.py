@@ -6,11 +6,73 @@ import streamlit as st
 import numpy as np
 from typing import Optional, Dict, Any
 
+from utils.supabase.database_manager import get_db
+
+
+# Partial reruns: st.fragment (Streamlit >= 1.37), st.experimental_fragment (1.33-1.36),
+# plain function call on older versions.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+
+@st.cache_data(ttl=600, max_entries=1, show_spinner=False)
+def load_tier_mv() -> pd.DataFrame:
+    """Fetch mv_comprehensive_tier_analysis once per 10 minutes instead of on every rerun."""
+    return get_db().get_tier_analysis()
+
+
+# Metric columns each analysis reads. Percentages (0-100) and scores are
+# stored as float32, which is plenty and halves memory traffic.
+ANALYSIS_COLS = {
+    "Tier Mix Evolution": ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct', 'dominant_index'],
+    "Performance Trends": ['domain_avg', 'avg_tier_score_t1', 'avg_tier_score_t2', 'avg_tier_score_t3'],
+    "Strategic Analysis": [
+        'tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct',
+        'avg_tier_score_t1', 'avg_tier_score_t2', 'avg_tier_score_t3',
+        'domain_avg', 'dominant_index',
+    ],
+    "Comparative Analysis": ['domain_avg', 'tier_mix_t3_pct'],
+}
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise the MV's key columns once per distinct frame (cached across reruns)."""
+    df = df.copy()
+
+    if 'term' in df.columns:
+        df['term'] = pd.Categorical(df['term'], categories=sorted(df['term'].dropna().unique()), ordered=True)
+    if 'domain' in df.columns:
+        df['domain'] = df['domain'].astype('category')
+
+    # MV stores year_of_fellowship as an int (sometimes serialised as text);
+    # the page segments on "Year N" labels. Values that are already labels pass through.
+    if 'fellow_year' in df.columns:
+        years = pd.to_numeric(df['fellow_year'], errors='coerce').astype('Int64')
+        labels = np.where(years.notna(), "Year " + years.astype(str), df['fellow_year'].astype(object))
+        df['fellow_year'] = pd.Series(labels, index=df.index).astype('category')
+    if 'school_level' in df.columns:
+        df['school_level'] = df['school_level'].astype('category')
+
+    return df
+
+
+@st.cache_data(max_entries=2 * len(ANALYSIS_COLS), show_spinner=False)
+def _coerce_metrics(df: pd.DataFrame, cols: tuple) -> pd.DataFrame:
+    """Coerce only the metric columns the selected analysis needs to float32."""
+    df = df.copy()
+    for col in cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    return df
+
 
 class EnhancedTierProgressionPage:
     """Comprehensive Tier progression analysis using materialized view data."""
 
     def __init__(self):
+        self._domains: tuple = ()
+        self._segments: tuple = ()
+        self._metric_cols: list = []
         self.tier_colors = {
             'Tier 1': '#FF6B6B',  # Red - needs improvement
             'Tier 2': '#4ECDC4',  # Teal - progressing
@@ -33,10 +95,17 @@ class EnhancedTierProgressionPage:
             st.error("No materialized view data available.")
             return
 
-        # Sidebar controls
-        with st.sidebar:
-            st.header("🎛️ Analysis Controls")
-            
+        df = _prepare(df)
+        self._render_analysis(df)
+
+    @_fragment
+    def _render_analysis(self, df: pd.DataFrame):
+        """Controls + analysis body. Runs as a fragment so control changes only rerun this block."""
+        # Analysis controls (fragments cannot write to the sidebar, so they sit above the charts)
+        st.subheader("🎛️ Analysis Controls")
+        ctrl1, ctrl2, ctrl3 = st.columns([1, 2, 1])
+
+        with ctrl1:
             # Segment selection
             segment_options = {
                 "Overall": None,
@@ -47,8 +116,10 @@ class EnhancedTierProgressionPage:
             segment_choice = st.selectbox("Segment Analysis", list(segment_options.keys()))
             segment_col = segment_options[segment_choice]
             
+        with ctrl2:
             # Domain selection
-            available_domains = sorted(df['domain'].unique()) if 'domain' in df.columns else []
+            # domain is categorical after _prepare, so its categories are already sorted and unique
+            available_domains = list(df['domain'].cat.categories) if 'domain' in df.columns else []
             selected_domains = st.multiselect(
                 "Select Domains", 
                 available_domains, 
@@ -56,6 +127,7 @@ class EnhancedTierProgressionPage:
                 key="domain_filter"
             )
             
+        with ctrl3:
             # Analysis type
             analysis_type = st.radio(
                 "Analysis Focus",
@@ -63,8 +135,23 @@ class EnhancedTierProgressionPage:
                 key="analysis_type"
             )
 
-        # Filter data
-        filtered_df = df[df['domain'].isin(selected_domains)] if selected_domains else df
+        self._metric_cols = [c for c in ANALYSIS_COLS[analysis_type] if c in df.columns]
+        df = _coerce_metrics(df, tuple(self._metric_cols))
+
+        # Filter data (boolean indexing copies, so skip it when every domain is selected)
+        if selected_domains and len(selected_domains) < len(available_domains):
+            filtered_df = df.loc[df['domain'].isin(selected_domains)]
+            chosen = set(selected_domains)
+            self._domains = tuple(d for d in available_domains if d in chosen)
+        else:
+            filtered_df = df
+            self._domains = tuple(available_domains)
+
+        # Segment values are looked up by several helpers; resolve them once per rerun
+        if segment_col and segment_col != "both":
+            self._segments = tuple(sorted(filtered_df[segment_col].dropna().unique()))
+        else:
+            self._segments = ()
 
         # Main analysis dispatch
         if analysis_type == "Tier Mix Evolution":
@@ -79,51 +166,48 @@ class EnhancedTierProgressionPage:
     def _render_tier_mix_analysis(self, df: pd.DataFrame, segment_col: str):
         """Analyze tier mix evolution across terms."""
         st.header("🎯 Tier Mix Evolution")
-        
-        # Aggregate data if needed
-        if segment_col == "both":
-            group_cols = ['term', 'domain', 'school_level', 'fellow_year']
-        elif segment_col:
-            group_cols = ['term', 'domain', segment_col]
-        else:
-            group_cols = ['term', 'domain']
+
+        # Charts, table and movements all share one (domain[, segment], term) aggregate
+        mix = self._tier_mix_agg(df, segment_col)
             
         # Create tier progression charts
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📊 Tier Distribution Over Time")
-            self._create_tier_distribution_chart(df, segment_col)
+            self._create_tier_distribution_chart(df, segment_col, mix)
             
         with col2:
             st.subheader("📈 Dominant Index Progression")
-            self._create_dominant_index_chart(df, segment_col)
-        
+            self._create_dominant_index_chart(df, segment_col, mix)
+
         # Tier mix table with progression indicators
         st.subheader("📋 Detailed Tier Mix Analysis")
-        self._create_tier_mix_table(df, segment_col)
+        self._create_tier_mix_table(mix, segment_col)
         
         # Movement analysis
         st.subheader("🔄 Term-to-Term Movement Analysis")
-        self._create_movement_analysis(df, segment_col)
+        self._create_movement_analysis(mix, segment_col)
 
     def _render_performance_trends(self, df: pd.DataFrame, segment_col: str):
         """Analyze performance trends across tiers and terms."""
         st.header("📊 Performance Trends Analysis")
+
+        agg = self._domain_term_agg(df)
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("🎯 Domain Performance Evolution")
-            self._create_domain_performance_chart(df, segment_col)
+            self._create_domain_performance_chart(agg, segment_col)
             
         with col2:
             st.subheader("🏆 Tier Performance Scores")
-            self._create_tier_performance_chart(df, segment_col)
+            self._create_tier_performance_chart(agg, segment_col)
         
         # Performance heatmap
         st.subheader("🔥 Performance Heatmap")
-        self._create_performance_heatmap(df, segment_col)
+        self._create_performance_heatmap(agg, segment_col)
         
         # Recovery analysis
         st.subheader("💪 Recovery & Resilience Analysis")
@@ -132,13 +216,15 @@ class EnhancedTierProgressionPage:
     def _render_strategic_analysis(self, df: pd.DataFrame, segment_col: str):
         """Strategic insights and pattern analysis."""
         st.header("🎯 Strategic Analysis")
+
+        agg = self._domain_term_agg(df)
         
         # Strategic positioning
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("🎪 Strategic Positioning")
-            self._create_strategic_positioning_chart(df, segment_col)
+            self._create_strategic_positioning_chart(agg, segment_col)
             
         with col2:
             st.subheader("⚡ Tier Strength Analysis")
@@ -146,7 +232,7 @@ class EnhancedTierProgressionPage:
         
         # Pattern recognition
         st.subheader("🔍 Pattern Recognition")
-        self._create_pattern_analysis(df, segment_col)
+        self._create_pattern_analysis(agg, segment_col)
         
         # Strategic recommendations
         st.subheader("💡 Strategic Insights")
@@ -175,47 +261,51 @@ class EnhancedTierProgressionPage:
         st.subheader("📈 Trend Analysis")
         self._create_trend_analysis(df, segment_col)
 
+    def _domain_term_agg(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Mean of the analysis' metric columns per (domain, term), shared by the charts of a section."""
+        return df.groupby(['domain', 'term'], observed=True)[self._metric_cols].mean().reset_index()
+
+    def _mix_keys(self, segment_col: str) -> list:
+        return ['domain', segment_col] if segment_col and segment_col != "both" else ['domain']
+
+    def _tier_mix_agg(self, df: pd.DataFrame, segment_col: str) -> pd.DataFrame:
+        """Tier mix and dominant index means per domain (and segment) per term, sorted by term."""
+        cols = ['tier_mix_t1_pct', 'tier_mix_t2_pct', 'tier_mix_t3_pct', 'dominant_index']
+        return df.groupby(self._mix_keys(segment_col) + ['term'], observed=True)[cols].mean().reset_index()
+
     # Chart creation methods
-    def _create_tier_distribution_chart(self, df: pd.DataFrame, segment_col: str):
+    def _create_tier_distribution_chart(self, df: pd.DataFrame, segment_col: str, mix: pd.DataFrame):
         """Create stacked area chart for tier distribution."""
         # Prepare data for stacked area chart
         if segment_col and segment_col != "both":
             fig = make_subplots(
-                rows=len(df[segment_col].unique()), cols=1,
+                rows=len(self._segments), cols=1,
                 subplot_titles=[f"{segment_col.replace('_', ' ').title()}: {val}" 
-                              for val in sorted(df[segment_col].unique())],
+                              for val in self._segments],
                 shared_xaxes=True, vertical_spacing=0.1
             )
             
-            for i, segment_val in enumerate(sorted(df[segment_col].unique()), 1):
-                segment_data = df[df[segment_col] == segment_val]
-                
-                for domain in sorted(segment_data['domain'].unique()):
-                    domain_data = segment_data[segment_data['domain'] == domain]
-                    
-                    fig.add_trace(
-                        go.Scatter(
-                            x=domain_data['term'],
-                            y=domain_data['tier_mix_t3_pct'],
-                            mode='lines+markers',
-                            name=f"{domain} - Tier 3",
-                            line=dict(color=self.domain_colors.get(domain, '#888888')),
-                            showlegend=(i == 1)
-                        ),
-                        row=i, col=1
-                    )
+            # One groupby split (segment, then domain order) instead of a mask per segment and domain
+            row_of = {segment_val: i for i, segment_val in enumerate(self._segments, 1)}
+            for (segment_val, domain), domain_data in df.groupby([segment_col, 'domain'], observed=True):
+                i = row_of[segment_val]
+                fig.add_trace(
+                    go.Scattergl(
+                        x=domain_data['term'],
+                        y=domain_data['tier_mix_t3_pct'],
+                        mode='lines+markers',
+                        name=f"{domain} - Tier 3",
+                        line=dict(color=self.domain_colors.get(domain, '#888888')),
+                        showlegend=(i == 1)
+                    ),
+                    row=i, col=1
+                )
         else:
             # Overall view
             fig = go.Figure()
             
-            for domain in sorted(df['domain'].unique()):
-                domain_data = df[df['domain'] == domain].groupby('term').agg({
-                    'tier_mix_t1_pct': 'mean',
-                    'tier_mix_t2_pct': 'mean', 
-                    'tier_mix_t3_pct': 'mean'
-                }).reset_index()
-                
-                fig.add_trace(go.Scatter(
+            for domain, domain_data in mix.groupby('domain', observed=True):
+                fig.add_trace(go.Scattergl(
                     x=domain_data['term'],
                     y=domain_data['tier_mix_t3_pct'],
                     mode='lines+markers',
@@ -232,29 +322,22 @@ class EnhancedTierProgressionPage:
         
         st.plotly_chart(fig, use_container_width=True)
 
-    def _create_dominant_index_chart(self, df: pd.DataFrame, segment_col: str):
+    def _create_dominant_index_chart(self, df: pd.DataFrame, segment_col: str, mix: pd.DataFrame):
         """Create dominant index progression chart."""
         fig = go.Figure()
         
         if segment_col and segment_col != "both":
-            for segment_val in sorted(df[segment_col].unique()):
-                segment_data = df[df[segment_col] == segment_val]
-                
-                for domain in sorted(segment_data['domain'].unique()):
-                    domain_data = segment_data[segment_data['domain'] == domain]
-                    
-                    fig.add_trace(go.Scatter(
-                        x=domain_data['term'],
-                        y=domain_data['dominant_index'],
-                        mode='lines+markers',
-                        name=f"{domain} ({segment_val})",
-                        line=dict(color=self.domain_colors.get(domain, '#888888'))
-                    ))
+            for (segment_val, domain), domain_data in df.groupby([segment_col, 'domain'], observed=True):
+                fig.add_trace(go.Scattergl(
+                    x=domain_data['term'],
+                    y=domain_data['dominant_index'],
+                    mode='lines+markers',
+                    name=f"{domain} ({segment_val})",
+                    line=dict(color=self.domain_colors.get(domain, '#888888'))
+                ))
         else:
-            for domain in sorted(df['domain'].unique()):
-                domain_data = df[df['domain'] == domain].groupby('term')['dominant_index'].mean().reset_index()
-                
-                fig.add_trace(go.Scatter(
+            for domain, domain_data in mix.groupby('domain', observed=True):
+                fig.add_trace(go.Scattergl(
                     x=domain_data['term'],
                     y=domain_data['dominant_index'],
                     mode='lines+markers',
@@ -276,130 +359,79 @@ class EnhancedTierProgressionPage:
         
         st.plotly_chart(fig, use_container_width=True)
 
-    def _create_tier_mix_table(self, df: pd.DataFrame, segment_col: str):
+    def _create_tier_mix_table(self, mix: pd.DataFrame, segment_col: str):
         """Create detailed tier mix table with progression indicators."""
-        if segment_col and segment_col != "both":
-            pivot_cols = ['domain', segment_col]
-        else:
-            pivot_cols = ['domain']
-            
-        # Create summary table
-        summary_data = []
-        
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain]
-            
-            if segment_col and segment_col != "both":
-                for segment_val in sorted(domain_data[segment_col].unique()):
-                    seg_data = domain_data[domain_data[segment_col] == segment_val]
-                    self._add_progression_row(summary_data, seg_data, domain, segment_val)
-            else:
-                agg_data = domain_data.groupby('term').agg({
-                    'tier_mix_t1_pct': 'mean',
-                    'tier_mix_t2_pct': 'mean',
-                    'tier_mix_t3_pct': 'mean',
-                    'dominant_index': 'mean'
-                }).reset_index()
-                self._add_progression_row(summary_data, agg_data, domain)
-        
-        summary_df = pd.DataFrame(summary_data)
-        
-        # Style the dataframe
-        if not summary_df.empty:
-            st.dataframe(
-                summary_df.style.format({
-                    col: '{:.1f}%' for col in summary_df.columns if 'pct' in col or 'T' in col
-                }).format({
-                    col: '{:.2f}' for col in summary_df.columns if 'index' in col.lower()
-                }),
-                use_container_width=True
-            )
+        key_cols = self._mix_keys(segment_col)
+        labels = {
+            'tier_mix_t1_pct': 'T1%',
+            'tier_mix_t2_pct': 'T2%',
+            'tier_mix_t3_pct': 'T3%',
+            'dominant_index': 'Index'
+        }
 
-    def _add_progression_row(self, summary_data: list, data: pd.DataFrame, domain: str, segment_val: str = None):
-        """Add a progression row to summary data."""
-        terms = sorted(data['term'].unique())
-        
-        if len(terms) < 2:
+        grouped = mix.groupby(key_cols, observed=True)
+        n_terms = grouped['term'].size()
+        keep = n_terms[n_terms >= 2].index
+        if keep.empty:
             return
-            
-        row = {
-            'Domain': domain,
-            'Segment': segment_val or 'Overall'
-        }
-        
-        # Add term-specific data
-        for term in terms:
-            term_data = data[data['term'] == term].iloc[0] if len(data[data['term'] == term]) > 0 else None
-            if term_data is not None:
-                row[f'{term} T1%'] = term_data['tier_mix_t1_pct']
-                row[f'{term} T2%'] = term_data['tier_mix_t2_pct'] 
-                row[f'{term} T3%'] = term_data['tier_mix_t3_pct']
-                row[f'{term} Index'] = term_data['dominant_index']
-        
-        # Calculate changes
-        if len(terms) >= 2:
-            first_term = data[data['term'] == terms[0]].iloc[0]
-            last_term = data[data['term'] == terms[-1]].iloc[0]
-            
-            row['T3 Change'] = last_term['tier_mix_t3_pct'] - first_term['tier_mix_t3_pct']
-            row['Index Change'] = last_term['dominant_index'] - first_term['dominant_index']
-        
-        summary_data.append(row)
 
-    def _create_movement_analysis(self, df: pd.DataFrame, segment_col: str):
+        # One row per domain[/segment]: term columns via pivot, changes from first/last term
+        terms = sorted(mix['term'].unique())
+        wide = mix.pivot(index=key_cols, columns='term', values=list(labels))
+        wide = wide.reindex(index=keep, columns=[(m, t) for t in terms for m in labels])
+        wide.columns = [f'{t} {labels[m]}' for t in terms for m in labels]
+
+        first = grouped.head(1).set_index(key_cols).reindex(keep)
+        last = grouped.tail(1).set_index(key_cols).reindex(keep)
+        wide['T3 Change'] = last['tier_mix_t3_pct'] - first['tier_mix_t3_pct']
+        wide['Index Change'] = last['dominant_index'] - first['dominant_index']
+
+        summary_df = wide.reset_index().rename(columns={'domain': 'Domain'})
+        if len(key_cols) > 1:
+            summary_df = summary_df.rename(columns={key_cols[1]: 'Segment'})
+        else:
+            summary_df.insert(1, 'Segment', 'Overall')
+        
+        # Format client-side via column_config (no Styler HTML rendering)
+        st.dataframe(
+            summary_df,
+            column_config={
+                col: st.column_config.NumberColumn(format="%.2f" if 'index' in col.lower() else "%.1f%%")
+                for col in summary_df.columns if col not in ('Domain', 'Segment')
+            },
+            use_container_width=True
+        )
+
+    def _create_movement_analysis(self, mix: pd.DataFrame, segment_col: str):
         """Analyze term-to-term movements."""
-        movement_data = []
-        
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain].sort_values('term')
-            
-            if segment_col and segment_col != "both":
-                for segment_val in sorted(domain_data[segment_col].unique()):
-                    seg_data = domain_data[domain_data[segment_col] == segment_val]
-                    self._calculate_movements(movement_data, seg_data, domain, segment_val)
-            else:
-                agg_data = domain_data.groupby('term').agg({
-                    'tier_mix_t1_pct': 'mean',
-                    'tier_mix_t2_pct': 'mean', 
-                    'tier_mix_t3_pct': 'mean',
-                    'dominant_index': 'mean'
-                }).reset_index()
-                self._calculate_movements(movement_data, agg_data, domain)
-        
-        if movement_data:
-            movement_df = pd.DataFrame(movement_data)
-            st.dataframe(movement_df, use_container_width=True)
-
-    def _calculate_movements(self, movement_data: list, data: pd.DataFrame, domain: str, segment_val: str = None):
-        """Calculate term-to-term movements for a domain/segment."""
-        terms = sorted(data['term'].unique())
-        
-        for i in range(len(terms) - 1):
-            current_term = data[data['term'] == terms[i]].iloc[0]
-            next_term = data[data['term'] == terms[i + 1]].iloc[0]
-            
-            t3_change = next_term['tier_mix_t3_pct'] - current_term['tier_mix_t3_pct']
-            index_change = next_term['dominant_index'] - current_term['dominant_index']
-            
-            movement_type = "📈 Improvement" if t3_change > 2 else "📉 Decline" if t3_change < -2 else "➡️ Stable"
-            
-            movement_data.append({
-                'Domain': domain,
-                'Segment': segment_val or 'Overall',
-                'Period': f"{terms[i]} → {terms[i+1]}",
-                'T3 Change': f"{t3_change:+.1f}%",
-                'Index Change': f"{index_change:+.2f}",
-                'Movement': movement_type
-            })
+        key_cols = self._mix_keys(segment_col)
+
+        # Previous term's values within each domain/segment (mix is sorted by term)
+        prev = mix.groupby(key_cols, observed=True)[['term', 'tier_mix_t3_pct', 'dominant_index']].shift(1)
+        has_prev = prev['term'].notna()
+        if not has_prev.any():
+            return
+
+        t3_change = mix['tier_mix_t3_pct'] - prev['tier_mix_t3_pct']
+        index_change = mix['dominant_index'] - prev['dominant_index']
 
-    def _create_domain_performance_chart(self, df: pd.DataFrame, segment_col: str):
+        movement_df = pd.DataFrame({
+            'Domain': mix['domain'],
+            'Segment': mix[key_cols[1]] if len(key_cols) > 1 else 'Overall',
+            'Period': prev['term'].astype(str) + " → " + mix['term'].astype(str),
+            'T3 Change': t3_change.map("{:+.1f}%".format),
+            'Index Change': index_change.map("{:+.2f}".format),
+            'Movement': np.select([t3_change > 2, t3_change < -2], ["📈 Improvement", "📉 Decline"], default="➡️ Stable"),
+        })[has_prev].reset_index(drop=True)
+
+        st.dataframe(movement_df, use_container_width=True)
+
+    def _create_domain_performance_chart(self, agg: pd.DataFrame, segment_col: str):
         """Create domain performance evolution chart."""
         fig = go.Figure()
         
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain].groupby('term')['domain_avg'].mean().reset_index()
-            
-            fig.add_trace(go.Scatter(
+        for domain, domain_data in agg.groupby('domain', observed=True):
+            fig.add_trace(go.Scattergl(
                 x=domain_data['term'],
                 y=domain_data['domain_avg'],
                 mode='lines+markers',
@@ -416,18 +448,17 @@ class EnhancedTierProgressionPage:
         
         st.plotly_chart(fig, use_container_width=True)
 
-    def _create_tier_performance_chart(self, df: pd.DataFrame, segment_col: str):
+    def _create_tier_performance_chart(self, agg: pd.DataFrame, segment_col: str):
         """Create tier performance scores chart."""
         fig = make_subplots(rows=1, cols=3, subplot_titles=["Tier 1", "Tier 2", "Tier 3"])
         
         tier_cols = ['avg_tier_score_t1', 'avg_tier_score_t2', 'avg_tier_score_t3']
+        domain_groups = list(agg.groupby('domain', observed=True))
         
         for i, tier_col in enumerate(tier_cols, 1):
-            for domain in sorted(df['domain'].unique()):
-                domain_data = df[df['domain'] == domain].groupby('term')[tier_col].mean().reset_index()
-                
+            for domain, domain_data in domain_groups:
                 fig.add_trace(
-                    go.Scatter(
+                    go.Scattergl(
                         x=domain_data['term'],
                         y=domain_data[tier_col],
                         mode='lines+markers',
@@ -441,16 +472,15 @@ class EnhancedTierProgressionPage:
         fig.update_layout(title="Tier Performance Scores by Domain")
         st.plotly_chart(fig, use_container_width=True)
 
-    def _create_performance_heatmap(self, df: pd.DataFrame, segment_col: str):
+    def _create_performance_heatmap(self, agg: pd.DataFrame, segment_col: str):
         """Create performance heatmap."""
-        # Aggregate data for heatmap
-        heatmap_data = df.groupby(['domain', 'term'])['domain_avg'].mean().reset_index()
-        heatmap_pivot = heatmap_data.pivot(index='domain', columns='term', values='domain_avg')
+        # agg is already one row per (domain, term); only reshape it
+        heatmap_pivot = agg.pivot_table(values='domain_avg', index='domain', columns='term', observed=True)
         
         fig = go.Figure(data=go.Heatmap(
             z=heatmap_pivot.values,
-            x=heatmap_pivot.columns,
-            y=heatmap_pivot.index,
+            x=heatmap_pivot.columns.astype(str),
+            y=heatmap_pivot.index.astype(str),
             colorscale='RdYlGn',
             colorbar=dict(title="Performance Score")
         ))
@@ -466,48 +496,42 @@ class EnhancedTierProgressionPage:
     def _create_recovery_analysis(self, df: pd.DataFrame, segment_col: str):
         """Analyze recovery patterns from Term 2 to Term 3."""
         recovery_data = []
-        
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain]
+
+        # One pass: mean domain score per domain × term
+        recovery_terms = ['Term 1', 'Term 2', 'Term 3']
+        term_avgs = df.groupby(['domain', 'term'], observed=True)['domain_avg'].mean().unstack('term')
+        if not set(recovery_terms).issubset(term_avgs.columns):
+            return
+        term_avgs = term_avgs[recovery_terms].dropna()
+
+        for domain, (t1_avg, t2_avg, t3_avg) in zip(term_avgs.index, term_avgs.to_numpy()):
+            decline = t2_avg - t1_avg
+            recovery = t3_avg - t2_avg
+            net_change = t3_avg - t1_avg
             
-            t1_data = domain_data[domain_data['term'] == 'Term 1']
-            t2_data = domain_data[domain_data['term'] == 'Term 2'] 
-            t3_data = domain_data[domain_data['term'] == 'Term 3']
+            recovery_strength = "🚀 Exceptional" if recovery > 0.10 else "💪 Strong" if recovery > 0.05 else "📈 Moderate" if recovery > 0 else "📉 Continued Decline"
             
-            if not (t1_data.empty or t2_data.empty or t3_data.empty):
-                t1_avg = t1_data['domain_avg'].mean()
-                t2_avg = t2_data['domain_avg'].mean()
-                t3_avg = t3_data['domain_avg'].mean()
-                
-                decline = t2_avg - t1_avg
-                recovery = t3_avg - t2_avg
-                net_change = t3_avg - t1_avg
-                
-                recovery_strength = "🚀 Exceptional" if recovery > 0.10 else "💪 Strong" if recovery > 0.05 else "📈 Moderate" if recovery > 0 else "📉 Continued Decline"
-                
-                recovery_data.append({
-                    'Domain': domain,
-                    'T1 Score': f"{t1_avg:.2f}",
-                    'T2 Score': f"{t2_avg:.2f}",
-                    'T3 Score': f"{t3_avg:.2f}",
-                    'T1→T2 Change': f"{decline:+.2f}",
-                    'T2→T3 Recovery': f"{recovery:+.2f}",
-                    'Net Change': f"{net_change:+.2f}",
-                    'Recovery Pattern': recovery_strength
-                })
+            recovery_data.append({
+                'Domain': domain,
+                'T1 Score': f"{t1_avg:.2f}",
+                'T2 Score': f"{t2_avg:.2f}",
+                'T3 Score': f"{t3_avg:.2f}",
+                'T1→T2 Change': f"{decline:+.2f}",
+                'T2→T3 Recovery': f"{recovery:+.2f}",
+                'Net Change': f"{net_change:+.2f}",
+                'Recovery Pattern': recovery_strength
+            })
         
         if recovery_data:
             recovery_df = pd.DataFrame(recovery_data)
             st.dataframe(recovery_df, use_container_width=True)
 
-    def _create_strategic_positioning_chart(self, df: pd.DataFrame, segment_col: str):
-        """Create strategic positioning scatter plot."""
+    def _create_strategic_positioning_chart(self, agg: pd.DataFrame, segment_col: str):
+        """Create strategic positioning scatter plot (one point per domain and term)."""
         fig = go.Figure()
         
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain]
-            
-            fig.add_trace(go.Scatter(
+        for domain, domain_data in agg.groupby('domain', observed=True):
+            fig.add_trace(go.Scattergl(
                 x=domain_data['dominant_index'],
                 y=domain_data['domain_avg'],
                 mode='markers+text',
@@ -515,7 +539,8 @@ class EnhancedTierProgressionPage:
                 text=domain_data['term'],
                 textposition="top center",
                 marker=dict(
-                    size=domain_data['tier_mix_t3_pct'] / 2,  # Size by T3 percentage
+                    # Size by T3 percentage, bounded so bubbles neither vanish nor swamp the plot
+                    size=(domain_data['tier_mix_t3_pct'] / 2).clip(4, 24).fillna(4),
                     color=self.domain_colors.get(domain, '#888888')
                 )
             ))
@@ -535,29 +560,24 @@ class EnhancedTierProgressionPage:
 
     def _create_tier_strength_analysis(self, df: pd.DataFrame, segment_col: str):
         """Create tier strength indicator analysis."""
-        strength_data = []
-        
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain]
-            
-            for _, row in domain_data.iterrows():
-                # Calculate tier strength (weighted performance)
-                tier_strength = (
-                    row['avg_tier_score_t1'] * row['tier_mix_t1_pct'] / 100 * 1 +
-                    row['avg_tier_score_t2'] * row['tier_mix_t2_pct'] / 100 * 2 +
-                    row['avg_tier_score_t3'] * row['tier_mix_t3_pct'] / 100 * 3
-                ) / 3  # Normalize
-                
-                strength_data.append({
-                    'Domain': domain,
-                    'Term': row['term'],
-                    'Tier Strength': tier_strength,
-                    'Segment': row.get(segment_col, 'Overall') if segment_col else 'Overall'
-                })
-        
-        if strength_data:
-            strength_df = pd.DataFrame(strength_data)
-            
+        data = df.sort_values('domain', kind='stable')
+
+        # Tier strength (weighted performance), computed column-wise
+        tier_strength = (
+            data['avg_tier_score_t1'] * data['tier_mix_t1_pct'] / 100 * 1 +
+            data['avg_tier_score_t2'] * data['tier_mix_t2_pct'] / 100 * 2 +
+            data['avg_tier_score_t3'] * data['tier_mix_t3_pct'] / 100 * 3
+        ) / 3  # Normalize
+
+        has_segment = segment_col in data.columns if segment_col else False
+        strength_df = pd.DataFrame({
+            'Domain': data['domain'],
+            'Term': data['term'],
+            'Tier Strength': tier_strength,
+            'Segment': data[segment_col] if has_segment else 'Overall'
+        })
+
+        if not strength_df.empty:
             fig = px.bar(
                 strength_df,
                 x='Term',
@@ -569,41 +589,29 @@ class EnhancedTierProgressionPage:
             
             st.plotly_chart(fig, use_container_width=True)
 
-    def _create_pattern_analysis(self, df: pd.DataFrame, segment_col: str):
+    def _create_pattern_analysis(self, agg: pd.DataFrame, segment_col: str):
         """Identify and display patterns."""
         st.markdown("### 🔍 Identified Patterns")
         
-        patterns = []
-        
-        for domain in sorted(df['domain'].unique()):
-            domain_data = df[df['domain'] == domain].sort_values('term')
-            
-            if len(domain_data) >= 3:  # Need at least 3 terms
-                t1_t3 = domain_data.iloc[0]['tier_mix_t3_pct']
-                t2_t3 = domain_data.iloc[1]['tier_mix_t3_pct'] 
-                t3_t3 = domain_data.iloc[2]['tier_mix_t3_pct']
-                
-                # Pattern recognition
-                if t2_t3 < t1_t3 and t3_t3 > t2_t3:
-                    pattern = "U-Shape Recovery"
-                    emoji = "📈"
-                elif t3_t3 > t2_t3 > t1_t3:
-                    pattern = "Consistent Growth"
-                    emoji = "🚀"
-                elif t1_t3 > t2_t3 > t3_t3:
-                    pattern = "Steady Decline"
-                    emoji = "📉"
-                elif abs(t1_t3 - t3_t3) < 5:  # Within 5%
-                    pattern = "Stable Performance"
-                    emoji = "➡️"
-                else:
-                    pattern = "Volatile"
-                    emoji = "📊"
-                
-                patterns.append(f"{emoji} **{domain}**: {pattern} (T3%: {t1_t3:.0f}% → {t2_t3:.0f}% → {t3_t3:.0f}%)")
-        
-        for pattern in patterns:
-            st.markdown(f"- {pattern}")
+        # Tier 3 share per domain for the first three terms (need all three)
+        t3 = agg.pivot(index='domain', columns='term', values='tier_mix_t3_pct').dropna(axis=1, how='all')
+        if t3.shape[1] < 3:
+            return
+        t3 = t3.iloc[:, :3].dropna()
+        t1_t3, t2_t3, t3_t3 = (t3.iloc[:, i] for i in range(3))
+
+        # Pattern recognition (first matching rule wins)
+        conditions = [
+            (t2_t3 < t1_t3) & (t3_t3 > t2_t3),
+            (t3_t3 > t2_t3) & (t2_t3 > t1_t3),
+            (t1_t3 > t2_t3) & (t2_t3 > t3_t3),
+            (t1_t3 - t3_t3).abs() < 5,  # Within 5%
+        ]
+        pattern = np.select(conditions, ["U-Shape Recovery", "Consistent Growth", "Steady Decline", "Stable Performance"], default="Volatile")
+        emoji = np.select(conditions, ["📈", "🚀", "📉", "➡️"], default="📊")
+
+        for domain, p, e, a, b, c in zip(t3.index, pattern, emoji, t1_t3, t2_t3, t3_t3):
+            st.markdown(f"- {e} **{domain}**: {p} (T3%: {a:.0f}% → {b:.0f}% → {c:.0f}%)")
 
     def _create_strategic_recommendations(self, df: pd.DataFrame, segment_col: str):
         """Generate strategic recommendations based on data."""
@@ -623,7 +631,7 @@ class EnhancedTierProgressionPage:
             
             # Recovery analysis
             recovery_domains = []
-            for domain in df['domain'].unique():
+            for domain in self._domains:
                 domain_data = df[df['domain'] == domain].sort_values('term')
                 if len(domain_data) >= 2:
                     improvement = domain_data.iloc[-1]['tier_mix_t3_pct'] - domain_data.iloc[-2]['tier_mix_t3_pct']
@@ -649,34 +657,31 @@ class EnhancedTierProgressionPage:
         
         st.plotly_chart(fig, use_container_width=True)
 
+    def _segment_term_t3(self, df: pd.DataFrame, segment_col: str) -> pd.DataFrame:
+        """Mean Tier 3 share per segment, domain and term (term-ordered within each group)."""
+        return (
+            df.groupby([segment_col, 'domain', 'term'], observed=True)['tier_mix_t3_pct']
+            .mean().dropna().reset_index()
+        )
+
     def _create_progression_rate_analysis(self, df: pd.DataFrame, segment_col: str):
         """Analyze progression rates across segments."""
-        progression_data = []
-        
-        for segment_val in sorted(df[segment_col].unique()):
-            segment_data = df[df[segment_col] == segment_val]
-            
-            for domain in sorted(segment_data['domain'].unique()):
-                domain_data = segment_data[segment_data['domain'] == domain].sort_values('term')
-                
-                if len(domain_data) >= 2:
-                    first_term = domain_data.iloc[0]
-                    last_term = domain_data.iloc[-1]
-                    
-                    progression_rate = (last_term['tier_mix_t3_pct'] - first_term['tier_mix_t3_pct']) / len(domain_data)
-                    
-                    progression_data.append({
-                        'Segment': segment_val,
-                        'Domain': domain,
-                        'Progression Rate': progression_rate,
-                        'Starting T3%': first_term['tier_mix_t3_pct'],
-                        'Ending T3%': last_term['tier_mix_t3_pct'],
-                        'Total Change': last_term['tier_mix_t3_pct'] - first_term['tier_mix_t3_pct']
-                    })
-        
-        if progression_data:
-            progression_df = pd.DataFrame(progression_data)
-            
+        t3 = self._segment_term_t3(df, segment_col)
+        grouped = t3.groupby([segment_col, 'domain'], observed=True)['tier_mix_t3_pct']
+        stats = pd.DataFrame({'first': grouped.first(), 'last': grouped.last(), 'n': grouped.size()})
+        stats = stats[stats['n'] >= 2]
+        change = stats['last'] - stats['first']
+
+        progression_df = pd.DataFrame({
+            'Segment': stats.index.get_level_values(0),
+            'Domain': stats.index.get_level_values(1),
+            'Progression Rate': (change / stats['n']).to_numpy(),
+            'Starting T3%': stats['first'].to_numpy(),
+            'Ending T3%': stats['last'].to_numpy(),
+            'Total Change': change.to_numpy()
+        })
+        
+        if not progression_df.empty:
             fig = px.scatter(
                 progression_df,
                 x='Starting T3%',
@@ -698,12 +703,13 @@ class EnhancedTierProgressionPage:
             
             # Show progression table
             st.dataframe(
-                progression_df.style.format({
-                    'Progression Rate': '{:.2f}%/term',
-                    'Starting T3%': '{:.1f}%',
-                    'Ending T3%': '{:.1f}%',
-                    'Total Change': '{:+.1f}%'
-                }),
+                progression_df,
+                column_config={
+                    'Progression Rate': st.column_config.NumberColumn(format="%.2f%%/term"),
+                    'Starting T3%': st.column_config.NumberColumn(format="%.1f%%"),
+                    'Ending T3%': st.column_config.NumberColumn(format="%.1f%%"),
+                    'Total Change': st.column_config.NumberColumn(format="%+.1f%%")
+                },
                 use_container_width=True
             )
 
@@ -711,51 +717,42 @@ class EnhancedTierProgressionPage:
         """Create trend analysis with statistical insights."""
         st.markdown("### 📈 Statistical Trend Analysis")
         
-        trend_data = []
-        
-        for segment_val in sorted(df[segment_col].unique()):
-            segment_data = df[df[segment_col] == segment_val]
-            
-            for domain in sorted(segment_data['domain'].unique()):
-                domain_data = segment_data[segment_data['domain'] == domain].sort_values('term')
-                
-                if len(domain_data) >= 3:  # Need at least 3 points for trend
-                    # Simple linear trend calculation
-                    x_vals = range(len(domain_data))
-                    y_vals = domain_data['tier_mix_t3_pct'].values
-                    
-                    # Calculate slope (trend)
-                    if len(x_vals) > 1:
-                        slope = np.polyfit(x_vals, y_vals, 1)[0]
-                        
-                        # Trend classification
-                        if slope > 5:
-                            trend = "📈 Strong Upward"
-                        elif slope > 2:
-                            trend = "📈 Moderate Upward" 
-                        elif slope > -2:
-                            trend = "➡️ Stable"
-                        elif slope > -5:
-                            trend = "📉 Moderate Downward"
-                        else:
-                            trend = "📉 Strong Downward"
-                        
-                        # Calculate volatility (standard deviation)
-                        volatility = np.std(y_vals)
-                        
-                        trend_data.append({
-                            'Segment': segment_val,
-                            'Domain': domain,
-                            'Trend': trend,
-                            'Slope': slope,
-                            'Volatility': volatility,
-                            'Latest T3%': y_vals[-1],
-                            'Change Range': f"{y_vals.min():.0f}% - {y_vals.max():.0f}%"
-                        })
-        
-        if trend_data:
-            trend_df = pd.DataFrame(trend_data)
-            
+        t3 = self._segment_term_t3(df, segment_col)
+        keys = [segment_col, 'domain']
+        grouped = t3.groupby(keys, observed=True)['tier_mix_t3_pct']
+
+        # Least-squares slope over term steps 0..n-1 per group (same as np.polyfit(deg=1))
+        t3['x'] = grouped.cumcount()
+        dx = t3['x'] - t3.groupby(keys, observed=True)['x'].transform('mean')
+        dy = t3['tier_mix_t3_pct'] - grouped.transform('mean')
+        moments = t3.assign(xy=dx * dy, xx=dx ** 2).groupby(keys, observed=True)[['xy', 'xx']].sum()
+
+        stats = pd.DataFrame({
+            'Slope': moments['xy'] / moments['xx'],
+            'Volatility': grouped.std(ddof=0),  # population std, as np.std
+            'Latest T3%': grouped.last(),
+            'min': grouped.min(),
+            'max': grouped.max(),
+            'n': grouped.size()
+        })
+        stats = stats[stats['n'] >= 3]  # Need at least 3 points for trend
+        slope = stats['Slope']
+
+        trend_df = pd.DataFrame({
+            'Segment': stats.index.get_level_values(0),
+            'Domain': stats.index.get_level_values(1),
+            'Trend': np.select(
+                [slope > 5, slope > 2, slope > -2, slope > -5],
+                ["📈 Strong Upward", "📈 Moderate Upward", "➡️ Stable", "📉 Moderate Downward"],
+                default="📉 Strong Downward"
+            ),
+            'Slope': slope.to_numpy(),
+            'Volatility': stats['Volatility'].to_numpy(),
+            'Latest T3%': stats['Latest T3%'].to_numpy(),
+            'Change Range': [f"{lo:.0f}% - {hi:.0f}%" for lo, hi in zip(stats['min'], stats['max'])]
+        })
+        
+        if not trend_df.empty:
             # Create trend visualization
             col1, col2 = st.columns(2)
             
@@ -777,7 +774,7 @@ class EnhancedTierProgressionPage:
             
             with col2:
                 # Trend summary
-                trend_summary = trend_df.groupby('Trend').size().reset_index(name='Count')
+                trend_summary = trend_df.groupby('Trend', sort=False).size().reset_index(name='Count')
                 
                 fig = px.pie(
                     trend_summary,
@@ -791,11 +788,12 @@ class EnhancedTierProgressionPage:
             # Show detailed trend table
             st.subheader("📊 Detailed Trend Analysis")
             st.dataframe(
-                trend_df.style.format({
-                    'Slope': '{:+.2f}%/term',
-                    'Volatility': '{:.1f}%',
-                    'Latest T3%': '{:.1f}%'
-                }),
+                trend_df,
+                column_config={
+                    'Slope': st.column_config.NumberColumn(format="%+.2f%%/term"),
+                    'Volatility': st.column_config.NumberColumn(format="%.1f%%"),
+                    'Latest T3%': st.column_config.NumberColumn(format="%.1f%%")
+                },
                 use_container_width=True
             )
             
@@ -825,7 +823,7 @@ class EnhancedTierProgressionPage:
         
         # Segment comparison
         if 'Segment' in trend_df.columns and len(trend_df['Segment'].unique()) > 1:
-            segment_trends = trend_df.groupby('Segment')['Slope'].mean()
+            segment_trends = trend_df.groupby('Segment', sort=False)['Slope'].mean()
             best_segment = segment_trends.idxmax()
             insights.append(f"🏆 **Best Performing Segment**: {best_segment} with average trend of {segment_trends[best_segment]:+.1f}% per term")
         
@@ -876,13 +874,16 @@ def create_sample_usage():
     return pd.DataFrame(sample_data)
 
 # Integration function for your Streamlit app
-def integrate_enhanced_tier_page(df: pd.DataFrame):
+def integrate_enhanced_tier_page(df: Optional[pd.DataFrame] = None):
     """
     Integration function to use the enhanced tier progression page in your app.
     
     Args:
         df: DataFrame from your materialized view mv_comprehensive_tier_analysis
+            (defaults to the cached ``load_tier_mv()`` result)
     """
+    if df is None:
+        df = load_tier_mv()
     
     # Initialize the enhanced page
     tier_page = EnhancedTierProgressionPage()
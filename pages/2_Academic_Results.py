@@ -51,7 +51,7 @@ st.markdown("""
 # -------------------------
 # Data Loading
 # -------------------------
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=300, max_entries=1)
 def load_academic_data():
     try:
         db = get_db()
@@ -64,6 +64,28 @@ def load_academic_data():
         st.error(f"Error loading data: {e}")
         return pd.DataFrame()
 
+def grade_key(g):
+    try:
+        if isinstance(g, (int, float)): return int(g)
+        return int(str(g).split()[-1])
+    except:
+        return 9999
+
+@st.cache_data(ttl=300, max_entries=1, show_spinner=False)
+def load_prepared_data():
+    """
+    Cleaned results plus the sorted filter option lists, derived once per cache period
+    instead of re-cleaning and re-sorting the columns on every rerun.
+    """
+    df = load_academic_data()
+    if df.empty:
+        return df, [], [], []
+    df_clean = prepare_data(df)
+    subj_opts = sorted(df_clean['subject'].dropna().unique()) if 'subject' in df_clean else []
+    phase_opts = sorted(df_clean['phase'].dropna().unique()) if 'phase' in df_clean else []
+    grade_opts = sorted(df_clean['grade'].dropna().unique(), key=grade_key) if 'grade' in df_clean else []
+    return df_clean, subj_opts, phase_opts, grade_opts
+
 # -------------------------
 # Export Recorder
 # -------------------------
@@ -131,6 +153,15 @@ def _safe(name: str) -> str:
 
 rec = ExportRecorder()
 
+# -------------------------
+# Utilities (local)
+# -------------------------
+def _first_present(df: pd.DataFrame, candidates: list[str]) -> str | None:
+    for c in candidates:
+        if c in df.columns:
+            return c
+    return None
+
 # -------------------------
 # Header
 # -------------------------
@@ -140,26 +171,14 @@ st.markdown('<p class="sub-header">Student performance and improvement across th
 # -------------------------
 # Load & Prepare
 # -------------------------
-df = load_academic_data()
-if df.empty:
+df_clean, subj_opts, phase_opts, grade_opts = load_prepared_data()
+if df_clean.empty:
     st.error("No data available. Please check your database connection.")
     st.stop()
 
-df_clean = prepare_data(df)
-
 # -------------------------
 # Filters
 # -------------------------
-subj_opts = sorted(df_clean['subject'].dropna().unique()) if 'subject' in df_clean else []
-phase_opts = sorted(df_clean['phase'].dropna().unique()) if 'phase' in df_clean else []
-
-def grade_key(g):
-    try:
-        if isinstance(g, (int, float)): return int(g)
-        return int(str(g).split()[-1])
-    except:
-        return 9999
-grade_opts = sorted(df_clean['grade'].dropna().unique(), key=grade_key) if 'grade' in df_clean else []
 
 with st.container():
     st.markdown('<div class="filter-container">', unsafe_allow_html=True)
@@ -204,18 +223,17 @@ rec.hr()
 # =========================================================
 rec.md("## 1. Executive Summary")
 # KPIs (robust to schema)
-k1, k2, k3, k4 = st.columns(4)
-with k1: st.metric("Records", len(filtered))
-with k2:
-    terms = sorted(filtered["term"].dropna().unique()) if "term" in filtered else []
-    st.metric("Terms", len(terms))
-with k3:
-    learners_col = "learner_id" if "learner_id" in filtered else ("student_id" if "student_id" in filtered else None)
-    st.metric("Unique Learners", int(filtered[learners_col].nunique()) if learners_col else 0)
-with k4:
-    score_col = _first_present(filtered, ["score", "mark", "percentage"])
-    overall = filtered[score_col].dropna() if score_col else pd.Series(dtype=float)
-    st.metric("Overall Avg", f"{overall.mean():.1f}" if not overall.empty else "—")
+learners_col = _first_present(filtered, ["learner_id", "student_id"])
+score_col = _first_present(filtered, ["score", "mark", "percentage"])
+overall = filtered[score_col].dropna() if score_col else pd.Series(dtype=float)
+KPIS = [
+    ("Records", len(filtered)),
+    ("Terms", int(filtered["term"].nunique()) if "term" in filtered else 0),
+    ("Unique Learners", int(filtered[learners_col].nunique()) if learners_col else 0),
+    ("Overall Avg", f"{overall.mean():.1f}" if not overall.empty else "—"),
+]
+for col, (label, value) in zip(st.columns(len(KPIS)), KPIS):
+    col.metric(label, value)
 
 # Summary by term (if present)
 if "term" in filtered and (score_col := _first_present(filtered, ["score", "mark", "percentage"])):
@@ -403,12 +421,3 @@ with colC:
     )
 
 st.caption("📊 Academic Results • Report view • Streamlit + Supabase")
-
-# -------------------------
-# Utilities (local)
-# -------------------------
-def _first_present(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    for c in candidates:
-        if c in df.columns:
-            return c
-    return None
@@ -13,7 +13,7 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 try:
-    from utils.supabase.database_manager import DatabaseManager
+    from utils.supabase.database_manager import DatabaseManager, get_db
 except Exception as e:
     DatabaseManager = None
     st.warning(f"DatabaseManager import failed ({e}). Using sample data.")
@@ -99,16 +99,16 @@ def dimension_scores(df: pd.DataFrame) -> dict:
 # =========================
 # Data Fetch
 # =========================
-@st.cache_data
+@st.cache_data(ttl=3600, max_entries=1)
 def load_wellbeing_data() -> pd.DataFrame:
     if DatabaseManager:
-        db = DatabaseManager()
+        db = get_db()  # shared cache_resource client, not a fresh one per cache miss
         df = db.get_teacher_wellbeing()
         # ensure count columns exist
         for col in ("doing_well", "trying_but_struggling", "stuck"):
             if col not in df.columns:
                 df[col] = 0
-        return df
+        return _categorize_filter_cols(df)
 
     # Fallback sample data
     st.info("Using sample data (DatabaseManager not available)")
@@ -130,6 +130,14 @@ def load_wellbeing_data() -> pd.DataFrame:
     df["doing_well"] = (df[ALL_ITEMS] == 3).sum(axis=1)
     df["trying_but_struggling"] = (df[ALL_ITEMS] == 2).sum(axis=1)
     df["stuck"] = (df[ALL_ITEMS] == 1).sum(axis=1)
+    return _categorize_filter_cols(df)
+
+
+def _categorize_filter_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """Sidebar filter columns as categoricals: options come straight off `.cat.categories`."""
+    for col in ("phase", "name_of_facilitator"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
     return df
 
 
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from components import filters
+
+
+class _Target:
+    """Stand-in for st.sidebar that records what the multiselect was handed."""
+
+    def __init__(self, query: str = ""):
+        self.query = query
+        self.calls = []
+
+    def text_input(self, label, key=None):
+        return self.query
+
+    def multiselect(self, label, options, default, key):
+        self.calls.append((options, default))
+        return default
+
+
+def _run(monkeypatch, n_options: int, query: str = "", state=None):
+    monkeypatch.setattr(filters, "st", SimpleNamespace(session_state=state or {}, sidebar=None))
+    options = [f"Fellow {i}" for i in range(n_options)]
+    target = _Target(query)
+    filters._multiselect("Fellow", options, options, "fellows", target)
+    return target.calls[0]
+
+
+def test_long_list_with_select_all_default_is_capped(monkeypatch):
+    options, default = _run(monkeypatch, 800)
+    assert len(options) <= filters.SEARCH_RESULT_LIMIT
+    assert set(default) <= set(options)
+
+
+def test_long_list_search_keeps_current_picks(monkeypatch):
+    options, _ = _run(monkeypatch, 800, query="fellow 79", state={"fellows": ["Fellow 3"]})
+    assert options[0] == "Fellow 3"
+    assert "Fellow 799" in options
+    assert len(options) <= filters.SEARCH_RESULT_LIMIT
+
+
+def test_short_list_is_untouched(monkeypatch):
+    options, default = _run(monkeypatch, 20)
+    assert len(options) == len(default) == 20
@@ -0,0 +1,36 @@
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from utils.xlsx_export import _cell_values, write_rows, xlsx_book
+
+
+def _write(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    book, header_fmt, date_fmt = xlsx_book(buf)
+    write_rows(book.add_worksheet("Sheet1"), df, 0, header_fmt, date_fmt)
+    book.close()
+    return buf.getvalue()
+
+
+def test_null_object_cells_are_blank():
+    # A nullable jsonb column as PostgREST returns it: dicts and None in one object column
+    df = pd.DataFrame([{"fellow": "A", "meta": {"k": 1}}, {"fellow": "B", "meta": None}])
+    assert _cell_values(df["meta"]) == ["{'k': 1}", None]
+    assert _write(df)
+
+
+def test_null_numeric_object_cells_are_blank():
+    df = pd.DataFrame({"score": pd.Series([1.5, None, 2], dtype=object)})
+    assert _cell_values(df["score"]) == [1.5, None, 2]
+    assert _write(df)
+
+
+def test_nan_and_inf_cells_do_not_raise():
+    df = pd.DataFrame({"pct": [12.5, np.nan, np.inf, -np.inf], "when": pd.to_datetime(["2025-01-01", None, None, None])})
+    assert _cell_values(df["pct"])[1] is None
+    with zipfile.ZipFile(io.BytesIO(_write(df))) as zf:
+        sheet = zf.read("xl/worksheets/sheet1.xml").decode()
+    assert "nan" not in sheet.lower()
@@ -28,7 +28,7 @@ def get_database_connection():
         st.error(f"Failed to establish database connection: {str(e)}")
         return None
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+@st.cache_data(ttl=3600, max_entries=1)  # Cache for 1 hour
 def load_tier_analysis_data():
     """Load data from the materialized view with caching."""
     db = get_database_connection()
@@ -286,7 +286,7 @@ if st.sidebar.checkbox("Render ALL views (long page)"):
 # =========================
 # Data Fetch – Materialized Views
 # =========================
-@st.cache_data
+@st.cache_data(ttl=3600, max_entries=1)
 def load_mvs() -> Dict[str, pd.DataFrame]:
     """
     Load all materialized views (MVs) defined in DatabaseManager.
@@ -1,12 +1,28 @@
 # utils/supabase/database_manager.py
 from __future__ import annotations
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+from functools import lru_cache
 from datetime import datetime
 
 import pandas as pd
 import streamlit as st
 from supabase import create_client, Client
 
+TIER_MIX_COLS = ("tier_mix_t1_pct", "tier_mix_t2_pct", "tier_mix_t3_pct")
+TIER_KEY_COLS = ("term", "domain", "school_level")
+
+
+@lru_cache(maxsize=None)
+def parse_order_by(order_by: str) -> Tuple[Tuple[str, bool], ...]:
+    """Parse "col1, col2 DESC, col3 ASC" once per literal into ((col, ascending), ...)."""
+    keys = []
+    for part in order_by.split(","):
+        tokens = part.split()
+        if tokens:
+            keys.append((tokens[0], len(tokens) < 2 or tokens[1].upper() != "DESC"))
+    return tuple(keys)
+
+
 # ======================================================
 # Client factory (secrets only – no getenv)
 # ======================================================
@@ -46,19 +62,33 @@ class DatabaseManager:
       - mv_teacher_wellbeing_dashboard (fallback: teacher_wellbeing)
       - report_academic_results
       - fellows (demographics subset only)
+      - mv_comprehensive_tier_analysis
     """
 
     def __init__(self, client: Optional[Client] = None):
         self.client: Optional[Client] = client or _build_supabase_client()
 
     # ---------- internals ----------
+    def fetch_table(self, table: str, columns: str = "*", order_by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Like `_safe_table`, but raises instead of returning an empty frame, so
+        `st.cache_data` callers don't cache a failure and retry it on the next run.
+        `order_by` ("col1, col2 DESC") is applied server-side by PostgREST.
+        """
+        if self.client is None:
+            raise RuntimeError("No Supabase client available")
+        query = self.client.table(table).select(columns)
+        for col, ascending in parse_order_by(order_by or ""):
+            query = query.order(col, desc=not ascending)
+        resp = query.execute()
+        return pd.DataFrame(resp.data) if getattr(resp, "data", None) else pd.DataFrame()
+
     def _safe_table(self, table: str, columns: str = "*") -> pd.DataFrame:
         if self.client is None:
             st.info(f"No Supabase client available; returning empty DataFrame for '{table}'.")
             return pd.DataFrame()
         try:
-            resp = self.client.table(table).select(columns).execute()
-            return pd.DataFrame(resp.data) if getattr(resp, "data", None) else pd.DataFrame()
+            return self.fetch_table(table, columns)
         except Exception as e:
             st.error(f"Error loading '{table}': {e}")
             return pd.DataFrame()
@@ -92,6 +122,21 @@ class DatabaseManager:
         )
         return self._safe_table("fellows", columns=cols)
 
+    def get_tier_analysis(self) -> pd.DataFrame:
+        """
+        Tier mix / dominant index MV per term, domain, fellowship year and school level.
+        Tier-mix percentages (0–100) are downcast to float32 and the low-cardinality
+        key columns to category, so chart groupbys and masks work on integer codes.
+        """
+        df = self._safe_table("mv_comprehensive_tier_analysis")
+        for col in TIER_MIX_COLS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+        for col in TIER_KEY_COLS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        return df
+
     # ---------- batch convenience ----------
     def load_all_dashboard(self) -> Dict[str, pd.DataFrame]:
         """Load the four dashboard datasets at once."""
@@ -123,6 +168,6 @@ def get_db() -> DatabaseManager:
     return DatabaseManager()
 
 
-__all__ = ["DatabaseManager", "get_db"]
+__all__ = ["DatabaseManager", "get_db", "parse_order_by"]
 
 
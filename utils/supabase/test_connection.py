@@ -82,13 +82,12 @@ def main() -> int:
             print("⚠️ Could not read any of the candidate tables. "
                   "This may be fine if names differ or RLS blocks anon.")
 
-        # Row counts summary
+        # Row counts summary (count pushed down to PostgREST: HEAD request, no rows transferred)
         summary = {}
         for t in candidates:
             try:
-                resp = client.table(t).select("*").execute()
-                cnt = len(resp.data) if getattr(resp, "data", None) is not None else None
-                summary[t] = cnt
+                resp = client.table(t).select("*", count="exact", head=True).execute()
+                summary[t] = getattr(resp, "count", None)
             except Exception:
                 summary[t] = None
 
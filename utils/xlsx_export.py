@@ -0,0 +1,53 @@
+# utils/xlsx_export.py
+# =============================================================================
+# Streamed xlsxwriter helpers shared by the report exports (app.py).
+# =============================================================================
+
+from __future__ import annotations
+from datetime import date, datetime
+import io
+
+import pandas as pd
+import xlsxwriter
+
+# Cell types xlsxwriter writes natively; anything else in an object column is written as its str()
+_XLSX_CELL_TYPES = (str, int, float, bool, datetime, date)
+
+
+def xlsx_book(buf: io.BytesIO):
+    """
+    xlsxwriter workbook in constant_memory mode (rows are flushed as soon as the next row starts,
+    so sheets must be written top to bottom) plus the header and datetime formats.
+    ±inf is written as an Excel error cell rather than raising.
+    """
+    book = xlsxwriter.Workbook(
+        buf,
+        {"constant_memory": True, "in_memory": True, "remove_timezone": True, "nan_inf_to_errors": True},
+    )
+    header_fmt = book.add_format({"bold": True, "border": 1, "align": "center"})
+    date_fmt = book.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+    return book, header_fmt, date_fmt
+
+
+def _cell_values(s: pd.Series) -> list:
+    """Column as xlsxwriter-ready Python values: NULL/NaN -> None, unsupported objects -> str."""
+    if s.dtype == object:
+        # Stringify first and null-out last: map() re-infers the dtype and would turn None back into NaN
+        s = s.map(lambda v: v if isinstance(v, _XLSX_CELL_TYPES) else str(v), na_action="ignore")
+    return s.astype(object).where(s.notna(), None).tolist()
+
+
+def write_rows(ws, df: pd.DataFrame, row: int, header_fmt, date_fmt) -> int:
+    """
+    Write df (header + body) into ws from `row` downwards with one write_row per record,
+    bypassing to_excel's per-cell formatter. NaN/None become blank cells. Returns the last row written.
+    """
+    ws.write_row(row, 0, [str(c) for c in df.columns], header_fmt)
+    date_idx = [i for i, c in enumerate(df.columns) if pd.api.types.is_datetime64_any_dtype(df[c])]
+    for values in zip(*(_cell_values(df[c]) for c in df.columns)):
+        row += 1
+        ws.write_row(row, 0, values)
+        for i in date_idx:
+            if values[i] is not None:
+                ws.write_datetime(row, i, values[i], date_fmt)
+    return row